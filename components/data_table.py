@@ -16,8 +16,10 @@ def _get_unique_display_values(df: pd.DataFrame, col: str) -> List[str]:
     series = df[col].dropna()
     if series.empty:
         return []
-    values = series.astype(str).unique().tolist()
-    return sorted(values)
+    # Let pandas dedupe and sort (Arrow kernels for pyarrow-backed strings)
+    # instead of sorting a Python list
+    values = series.astype(str).drop_duplicates()
+    return values.sort_values(kind="stable").tolist()
 
 
 def render_advanced_table(
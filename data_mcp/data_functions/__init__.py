@@ -30,7 +30,8 @@ from .transformation import (
     apply_custom,
     set_index,
     pivot_table,
-    melt_unpivot
+    melt_unpivot,
+    TransformationPipeline
 )
 
 # Selection tools
@@ -91,6 +92,7 @@ __all__ = [
     "set_index",
     "pivot_table",
     "melt_unpivot",
+    "TransformationPipeline",
     # Selection
     "select_columns",
     "filter_rows",
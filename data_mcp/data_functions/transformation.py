@@ -4,20 +4,696 @@ Handles column renaming, reordering, sorting, and basic transformations.
 """
 
 import logging
-from typing import List, Dict, Optional, Any, Union
+from typing import List, Dict, Optional, Any, Tuple, Union
 import pandas as pd
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = None
 
 from .core import get_table_data, commit_dataframe, _record_operation
 
 logger = logging.getLogger(__name__)
 
+# pandas >= 3 always uses Copy-on-Write and deprecates the ``copy`` keyword
+_PANDAS_LAZY_COPY = int(pd.__version__.split(".")[0]) >= 3
+
+# PyArrow compute kernels backing the string functions of apply_custom
+_PYARROW_STR_KERNELS = {
+    "strip": "utf8_trim_whitespace",
+    "lower": "utf8_lower",
+    "upper": "utf8_upper",
+    "title": "utf8_title",
+}
+
+# NumPy ufuncs backing the numeric functions of apply_custom
+_NUMPY_NUMERIC_UFUNCS = {
+    "double": lambda values: np.multiply(values, 2),
+    "square": np.square,
+    "abs": np.abs,
+    "round": np.round,
+}
+
+# Numba kernels for contiguous float64/int64 columns (compiled lazily on first call)
+_NUMBA_KERNELS = {}
+_NUMBA_DTYPES = (np.dtype(np.float64), np.dtype(np.int64))
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _double_kernel(a, out):
+        for i in prange(a.size):
+            out[i] = a[i] * 2
+
+    @njit(parallel=True, cache=True)
+    def _square_kernel(a, out):
+        for i in prange(a.size):
+            out[i] = a[i] * a[i]
+
+    @njit(parallel=True, cache=True)
+    def _abs_kernel(a, out):
+        for i in prange(a.size):
+            out[i] = abs(a[i])
+
+    @njit(parallel=True, cache=True)
+    def _round_kernel(a, out):
+        for i in prange(a.size):
+            out[i] = np.rint(a[i])
+
+    _NUMBA_KERNELS = {
+        "double": _double_kernel,
+        "square": _square_kernel,
+        "abs": _abs_kernel,
+        "round": _round_kernel,
+    }
+
+
+def _numeric_fast(series: pd.Series, op: str) -> pd.Series:
+    """
+    Apply a numeric transform, using a Numba kernel for float64/int64 columns.
+
+    Other numeric dtypes (nullable, float32, bool, ...) go through the
+    matching NumPy ufunc on the underlying values.
+    """
+    values = series.values
+    kernel = _NUMBA_KERNELS.get(op)
+    if kernel is not None and values.dtype in _NUMBA_DTYPES:
+        arr = np.ascontiguousarray(values)
+        out = np.empty_like(arr)
+        kernel(arr, out)
+    else:
+        out = _NUMPY_NUMERIC_UFUNCS[op](values)
+    return pd.Series(out, index=series.index, name=series.name)
+
+
+def _object_str_fast(series: pd.Series, op: str) -> pd.Series:
+    """
+    Apply a string transform with a single pass over the object values.
+
+    Non-string values are converted with ``str()`` inline, matching
+    ``astype(str)`` on columns without missing values while skipping the
+    intermediate copy.
+    """
+    method = getattr(str, op)
+    values = [method(x) if isinstance(x, str) else method(str(x)) for x in series.values]
+    return pd.Series(values, index=series.index, name=series.name, dtype=object)
+
+
+def _pyarrow_str_fast(series: pd.Series, op: str) -> pd.Series:
+    """
+    Apply a string transform using a vectorized PyArrow compute kernel.
+
+    Falls back to a plain object-array loop when PyArrow is not installed.
+    Columns with missing values keep the ``astype(str)`` path, whose
+    handling of missing values differs between pandas versions.
+    """
+    if series.hasnans:
+        return getattr(series.astype(str).str, op)()
+    if pa is None:
+        return _object_str_fast(series, op)
+    try:
+        arr = pa.array(series, type=pa.string())
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return _object_str_fast(series, op)
+    out = getattr(pc, _PYARROW_STR_KERNELS[op])(arr)
+    # Positional values: a Series from to_pandas() would realign on its RangeIndex
+    return pd.Series(out.to_numpy(zero_copy_only=False), index=series.index, name=series.name)
+
+
+def _arrow_preview(df: pd.DataFrame, n: int = 5) -> List[Dict[str, Any]]:
+    """
+    Convert the first ``n`` rows of a DataFrame to records through Arrow.
+
+    Falls back to ``to_dict(orient="records")`` when PyArrow is missing, the
+    columns are a MultiIndex, or the values cannot be converted.
+    """
+    if pa is not None and not isinstance(df.columns, pd.MultiIndex):
+        try:
+            return pa.Table.from_pandas(df.iloc[:n], preserve_index=False).to_pylist()
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, ValueError):
+            pass
+    return df.head(n).to_dict(orient="records")
+
+
+def _is_categorical_key(series: pd.Series) -> bool:
+    """Check whether a sort key holds strings or categories."""
+    return series.dtype == object or isinstance(series.dtype, (pd.CategoricalDtype, pd.StringDtype))
+
+
+def _factorized_sort_order(
+    df: pd.DataFrame,
+    by: List[str],
+    ascending: Union[bool, List[bool]],
+    na_position: str
+) -> Optional[np.ndarray]:
+    """
+    Compute a stable row order for string/categorical sort keys.
+
+    Each key is factorized once to sorted integer codes and the codes are
+    ordered with a single ``np.lexsort``, keeping the sort in native int space.
+    Returns None when any key is not string-like or cannot be factorized.
+    """
+    if not all(_is_categorical_key(df[col]) for col in by):
+        return None
+
+    ascending_list = ascending if isinstance(ascending, list) else [ascending] * len(by)
+    codes_list = []
+    try:
+        for col, asc in zip(by, ascending_list):
+            codes, uniques = pd.factorize(df[col].values, sort=True)
+            n_uniques = len(uniques)
+            if not asc:
+                codes = np.where(codes >= 0, n_uniques - 1 - codes, codes)
+            na_code = -1 if na_position == "first" else n_uniques
+            codes_list.append(np.where(codes < 0, na_code, codes))
+    except TypeError:
+        # Mixed types that cannot be ordered; let sort_values report it
+        return None
+
+    return np.lexsort(tuple(reversed(codes_list)))
+
+
+# Pivots above this many rows are pre-aggregated in DuckDB when it is installed
+_DUCKDB_MIN_ROWS = 100_000
+
+# DuckDB aggregates matching the pandas aggfunc names accepted by pivot_table
+_DUCKDB_AGGREGATES = {
+    "mean": "AVG",
+    "sum": "SUM",
+    "min": "MIN",
+    "max": "MAX",
+    "count": "COUNT",
+}
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote a column name for use in a DuckDB query."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _can_pivot_with_duckdb(
+    df: pd.DataFrame,
+    index: List[str],
+    columns: List[str],
+    values: Optional[List[str]],
+    aggfunc: str
+) -> bool:
+    """Check whether a pivot is large enough and simple enough for DuckDB."""
+    if duckdb is None or len(df) <= _DUCKDB_MIN_ROWS:
+        return False
+    if not values or aggfunc not in _DUCKDB_AGGREGATES:
+        return False
+    return all(isinstance(col, str) for col in index + columns + values)
+
+
+def _sum_sql_cast(expr: str, dtype: np.dtype) -> str:
+    """Cast a DuckDB SUM expression to BIGINT/UBIGINT for integer and bool columns."""
+    kind = getattr(dtype, "kind", "")
+    if kind in "ib":
+        return f"CAST({expr} AS BIGINT)"
+    if kind == "u":
+        return f"CAST({expr} AS UBIGINT)"
+    return expr
+
+
+def _duckdb_pivot_table(
+    df: pd.DataFrame,
+    index: List[str],
+    columns: List[str],
+    values: List[str],
+    aggfunc: str
+) -> Optional[pd.DataFrame]:
+    """
+    Build a pivot table by grouping in DuckDB and reshaping the result in pandas.
+
+    DuckDB scans the DataFrame in place and runs the aggregation on its
+    multi-threaded engine; pandas only reshapes the (much smaller) grouped
+    result, so the output layout matches ``pd.pivot_table``. Returns None
+    when DuckDB cannot scan the frame (e.g. mixed-type object columns), so
+    the caller falls back to ``pd.pivot_table``.
+    """
+    keys = index + columns
+    key_sql = ", ".join(_quote_identifier(col) for col in keys)
+    agg_sql = _DUCKDB_AGGREGATES[aggfunc]
+    if aggfunc == "sum":
+        # pandas sums an all-missing group to 0, DuckDB returns NULL. DuckDB also
+        # widens integer sums to HUGEINT (read back as float64), so cast them to
+        # the 64-bit integer type pandas produces
+        value_sql = ", ".join(
+            f"{_sum_sql_cast(f'COALESCE(SUM({_quote_identifier(col)}), 0)', df[col].dtype)} "
+            f"AS {_quote_identifier(col)}"
+            for col in values
+        )
+    else:
+        value_sql = ", ".join(
+            f"{agg_sql}({_quote_identifier(col)}) AS {_quote_identifier(col)}" for col in values
+        )
+    # pandas drops groups with missing keys
+    where_sql = " AND ".join(f"{_quote_identifier(col)} IS NOT NULL" for col in keys)
+    query = f"SELECT {key_sql}, {value_sql} FROM pivot_source WHERE {where_sql} GROUP BY {key_sql}"
+
+    con = duckdb.connect()
+    try:
+        con.register("pivot_source", df)
+        grouped = con.execute(query).df()
+    except (duckdb.Error, TypeError, ValueError):
+        return None
+    finally:
+        con.close()
+
+    return pd.pivot_table(grouped, index=index, columns=columns, values=values, aggfunc="first")
+
+
+# Whitelisted apply_custom functions
+_ALLOWED_FUNCTIONS = {
+    "double": {"type": "numeric", "func": lambda s: _numeric_fast(s, "double")},
+    "square": {"type": "numeric", "func": lambda s: _numeric_fast(s, "square")},
+    "abs": {"type": "numeric", "func": lambda s: _numeric_fast(s, "abs")},
+    "round": {"type": "numeric", "func": lambda s: _numeric_fast(s, "round")},
+    "strip": {"type": "string", "func": lambda s: _pyarrow_str_fast(s, "strip")},
+    "lower": {"type": "string", "func": lambda s: _pyarrow_str_fast(s, "lower")},
+    "upper": {"type": "string", "func": lambda s: _pyarrow_str_fast(s, "upper")},
+    "title": {"type": "string", "func": lambda s: _pyarrow_str_fast(s, "title")},
+    "to_string": {"type": "any", "func": lambda s: s.astype(str)},
+}
+_ALLOWED_FUNCTION_NAMES = ", ".join(sorted(_ALLOWED_FUNCTIONS))
+
+
+def _has_duplicates(values: List[Any]) -> bool:
+    """Check a sequence for repeated values, stopping at the first duplicate."""
+    seen = set()
+    for value in values:
+        if value in seen:
+            return True
+        seen.add(value)
+    return False
+
+
+def _validate_rename(columns: List[str], mapping: Dict[str, str]) -> Optional[str]:
+    """Validate a rename mapping against column labels, returning an error message if invalid."""
+    invalid_cols = [old for old in mapping.keys() if old not in columns]
+    if invalid_cols:
+        return f"Columns not found: {', '.join(invalid_cols)}"
+
+    new_names = list(mapping.values())
+    if _has_duplicates(new_names):
+        return "Duplicate new column names are not allowed"
+
+    existing_columns = set(columns) - set(mapping.keys())
+    conflicts = [name for name in new_names if name in existing_columns]
+    if conflicts:
+        return f"New column names conflict with existing columns: {', '.join(conflicts)}"
+    return None
+
+
+def _rename_frame(df: pd.DataFrame, mapping: Dict[str, str]) -> Tuple[pd.DataFrame, Optional[str]]:
+    """Rename columns of a DataFrame. Returns the new frame and an error message if invalid."""
+    error = _validate_rename(list(df.columns), mapping)
+    if error:
+        return df, error
+    return df.rename(columns=mapping), None
+
+
+def _reorder_frame(
+    df: pd.DataFrame,
+    columns: List[str],
+    case_insensitive: bool = False
+) -> Tuple[pd.DataFrame, Optional[str]]:
+    """Reorder columns of a DataFrame. Returns the new frame and an error message if invalid."""
+    if not columns:
+        return df, "Columns list cannot be empty"
+
+    if case_insensitive:
+        lower_columns = df.columns.str.lower().values
+        if len(np.unique(lower_columns)) != len(lower_columns):
+            return df, "Case-insensitive match is ambiguous for existing columns"
+        positions = pd.Series(np.arange(len(lower_columns)), index=lower_columns).reindex(
+            [col.lower() for col in columns]
+        )
+        missing_mask = positions.isna().values
+        if missing_mask.any():
+            return df, f"Columns not found: {columns[int(missing_mask.argmax())]}"
+        resolved_columns = df.columns[positions.values.astype(np.intp)].tolist()
+    else:
+        resolved_columns = columns
+        missing_cols = [col for col in resolved_columns if col not in df.columns]
+        if missing_cols:
+            return df, f"Columns not found: {', '.join(missing_cols)}"
+
+    if _has_duplicates(resolved_columns):
+        return df, "Duplicate columns in reorder list are not allowed"
+
+    # Allow partial reordering: append remaining columns at the end
+    original_columns = list(df.columns)
+    remaining_columns = [col for col in original_columns if col not in resolved_columns]
+    new_order = resolved_columns + remaining_columns
+    if new_order != original_columns:
+        # Reindex the column axis instead of selecting, so unchanged
+        # blocks are not copied
+        if _PANDAS_LAZY_COPY:
+            df = df.reindex(columns=new_order)
+        else:
+            df = df.reindex(columns=new_order, copy=False)
+    return df, None
+
+
+def _validate_sort(
+    df: pd.DataFrame,
+    by: List[str],
+    ascending: Union[bool, List[bool]],
+    na_position: str
+) -> Optional[str]:
+    """Validate sort arguments, returning an error message if invalid."""
+    # Validate columns exist
+    invalid_cols = [col for col in by if col not in df.columns]
+    if invalid_cols:
+        return f"Columns not found: {', '.join(invalid_cols)}"
+
+    if not by:
+        return "Sort columns cannot be empty"
+    if isinstance(ascending, list) and len(ascending) != len(by):
+        return "Ascending list length must match sort columns"
+    if na_position not in {"first", "last"}:
+        return "na_position must be 'first' or 'last'"
+    return None
+
+
+def _is_sorted(df: pd.DataFrame, by: List[str], ascending: Union[bool, List[bool]]) -> bool:
+    """
+    Check whether rows are already in the requested order.
+
+    Conservative: every key must be monotonic on its own in its sort
+    direction and free of missing values. Frames that are only
+    lexicographically sorted are not detected.
+    """
+    ascending_list = ascending if isinstance(ascending, list) else [ascending] * len(by)
+    for col, asc in zip(by, ascending_list):
+        series = df[col]
+        if series.hasnans:
+            return False
+        if not (series.is_monotonic_increasing if asc else series.is_monotonic_decreasing):
+            return False
+    return True
+
+
+def _sort_rows(
+    df: pd.DataFrame,
+    by: List[str],
+    ascending: Union[bool, List[bool]],
+    na_position: str,
+    reset_index: bool,
+    already_sorted: bool
+) -> pd.DataFrame:
+    """Sort validated keys, skipping the sort when rows are already in order."""
+    if already_sorted:
+        if reset_index:
+            df = df.copy(deep=False)
+            df.index = pd.RangeIndex(len(df))
+        return df
+
+    # String/categorical keys sort on factorized codes
+    order = _factorized_sort_order(df, by, ascending, na_position)
+    if order is not None:
+        df = df.take(order)
+        if reset_index:
+            # take() already returned a new frame; swap the index instead of copying again
+            df.index = pd.RangeIndex(len(df))
+        return df
+
+    return df.sort_values(
+        by=by,
+        ascending=ascending,
+        na_position=na_position,
+        ignore_index=reset_index,
+        kind="stable"
+    )
+
+
+def _sort_frame(
+    df: pd.DataFrame,
+    by: List[str],
+    ascending: Union[bool, List[bool]] = True,
+    na_position: str = "last",
+    reset_index: bool = False
+) -> Tuple[pd.DataFrame, Optional[str]]:
+    """Sort a DataFrame. Returns the sorted frame and an error message if invalid."""
+    error = _validate_sort(df, by, ascending, na_position)
+    if error:
+        return df, error
+    already_sorted = _is_sorted(df, by, ascending)
+    return _sort_rows(df, by, ascending, na_position, reset_index, already_sorted), None
+
+
+def _apply_frame(
+    df: pd.DataFrame,
+    column: str,
+    function: str,
+    new_column: Optional[str] = None
+) -> Tuple[pd.DataFrame, Optional[str]]:
+    """Apply a whitelisted function to a column. Returns the frame and an error message if invalid."""
+    if column not in df.columns:
+        return df, f"Column '{column}' not found in table"
+
+    if function not in _ALLOWED_FUNCTIONS:
+        return df, f"Unsupported function. Allowed: {_ALLOWED_FUNCTION_NAMES}"
+
+    func_spec = _ALLOWED_FUNCTIONS[function]
+    series = df[column]
+    func_type = func_spec["type"]
+    if func_type != "any":
+        kind = series.dtype.kind
+        if func_type == "numeric" and kind not in "iufcb":
+            return df, f"Function '{function}' requires a numeric column"
+        # Object columns (including categoricals) still need the full string check
+        if func_type == "string" and not (
+            kind in "SU" or (kind == "O" and pd.api.types.is_string_dtype(series))
+        ):
+            return df, f"Function '{function}' requires a string column"
+
+    try:
+        result_series = func_spec["func"](series)
+    except Exception as e:
+        return df, f"Failed to apply function: {str(e)}"
+
+    # Results normally share the frame's index (an identity check), so assign raw
+    # values and skip realignment; anything else is aligned by label first
+    if result_series.index.equals(df.index):
+        values = result_series.values
+    else:
+        values = result_series.reindex(df.index).values
+    if new_column:
+        df[new_column] = values
+    else:
+        loc = df.columns.get_loc(column)
+        if isinstance(loc, int):
+            # Replace the column array without splitting its block
+            df.isetitem(loc, values)
+        else:
+            df[column] = result_series
+    return df, None
+
+
+class TransformationPipeline:
+    """
+    Deferred chain of transformations on a single table.
+
+    Steps are only recorded until ``commit()``, which loads the table once,
+    applies every step in order and saves the result with a single
+    ``commit_dataframe`` call. Consecutive renames are fused into one rename.
+
+    Example:
+        pipeline = TransformationPipeline("session_123")
+        pipeline.rename({"Company": "Manufacturer"}).reorder(["Manufacturer"]).sort(["Price"])
+        result = pipeline.commit()
+    """
+
+    def __init__(self, session_id: str, table_name: str = "current"):
+        self.session_id = session_id
+        self.table_name = table_name
+        self._steps: List[Tuple[str, Dict[str, Any]]] = []
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def rename(self, mapping: Dict[str, str]) -> "TransformationPipeline":
+        """Queue a column rename."""
+        self._steps.append(("rename_columns", {"mapping": dict(mapping)}))
+        return self
+
+    def reorder(self, columns: List[str], case_insensitive: bool = False) -> "TransformationPipeline":
+        """Queue a column reorder."""
+        self._steps.append(("reorder_columns", {"columns": list(columns), "case_insensitive": case_insensitive}))
+        return self
+
+    def sort(
+        self,
+        by: List[str],
+        ascending: Union[bool, List[bool]] = True,
+        na_position: str = "last",
+        reset_index: bool = False
+    ) -> "TransformationPipeline":
+        """Queue a sort."""
+        self._steps.append(("sort_data", {
+            "by": list(by),
+            "ascending": ascending,
+            "na_position": na_position,
+            "reset_index": reset_index
+        }))
+        return self
+
+    def apply(self, column: str, function: str, new_column: Optional[str] = None) -> "TransformationPipeline":
+        """Queue a whitelisted custom function."""
+        self._steps.append(("apply_custom", {"column": column, "function": function, "new_column": new_column}))
+        return self
+
+    def _run_renames(self, df: pd.DataFrame, mappings: List[Dict[str, str]]) -> Tuple[pd.DataFrame, Optional[str]]:
+        """Validate consecutive renames step by step, then rename the frame once."""
+        original_columns = list(df.columns)
+        current_columns = original_columns
+        for mapping in mappings:
+            error = _validate_rename(current_columns, mapping)
+            if error:
+                return df, error
+            current_columns = [mapping.get(col, col) for col in current_columns]
+        fused = {old: new for old, new in zip(original_columns, current_columns) if old != new}
+        return df.rename(columns=fused), None
+
+    def commit(self, target_table: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Apply all queued steps and save the result.
+
+        Args:
+            target_table: Table to write to (default: the pipeline's table)
+
+        Returns:
+            Dictionary with operation result
+        """
+        try:
+            if not self._steps:
+                return {
+                    "success": False,
+                    "error": "Pipeline has no queued transformations"
+                }
+
+            df = get_table_data(self.session_id, self.table_name)
+            if df is None:
+                return {
+                    "success": False,
+                    "error": f"Table '{self.table_name}' not found in session {self.session_id}"
+                }
+
+            original_columns = list(df.columns)
+            row_count = len(df)
+            # Shallow copy so a failing step leaves the stored table untouched
+            df = df.copy(deep=False)
+
+            i = 0
+            while i < len(self._steps):
+                op, params = self._steps[i]
+                if op == "rename_columns":
+                    mappings = []
+                    while i < len(self._steps) and self._steps[i][0] == "rename_columns":
+                        mappings.append(self._steps[i][1]["mapping"])
+                        i += 1
+                    df, error = self._run_renames(df, mappings)
+                else:
+                    if op == "reorder_columns":
+                        df, error = _reorder_frame(df, **params)
+                    elif op == "sort_data":
+                        df, error = _sort_frame(df, **params)
+                    else:
+                        df, error = _apply_frame(df, **params)
+                    i += 1
+                if error:
+                    return {
+                        "success": False,
+                        "error": f"Step '{op}' failed: {error}"
+                    }
+
+            target_table = target_table or self.table_name
+            if commit_dataframe(self.session_id, target_table, df):
+                steps = [{"type": op, **params} for op, params in self._steps]
+                _record_operation(self.session_id, target_table, {
+                    "type": "pipeline",
+                    "steps": steps,
+                    "original_columns": original_columns,
+                    "new_columns": list(df.columns),
+                    "target_table": target_table,
+                    "rows_before": row_count,
+                    "rows_after": row_count
+                })
+                self._steps = []
+
+                return {
+                    "success": True,
+                    "message": f"Applied {len(steps)} transformations",
+                    "session_id": self.session_id,
+                    "table_name": target_table,
+                    "steps": steps,
+                    "new_columns": list(df.columns),
+                    "preview": _arrow_preview(df)
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": "Failed to save changes to session"
+                }
+
+        except Exception as e:
+            logger.error(f"Failed to commit transformation pipeline: {e}")
+            return {
+                "success": False,
+                "error": f"Failed to commit transformation pipeline: {str(e)}"
+            }
+
+
+def _queue_on_pipeline(
+    pipeline: TransformationPipeline,
+    session_id: str,
+    table_name: str
+) -> Optional[Dict[str, Any]]:
+    """Check that a pipeline matches the requested table, returning an error response if not."""
+    if pipeline.session_id != session_id or pipeline.table_name != table_name:
+        return {
+            "success": False,
+            "error": f"Pipeline is bound to table '{pipeline.table_name}' in session {pipeline.session_id}"
+        }
+    return None
+
+
+def _queued_response(pipeline: TransformationPipeline, operation: str) -> Dict[str, Any]:
+    """Build the response for a step queued on a pipeline."""
+    return {
+        "success": True,
+        "queued": True,
+        "message": f"Queued {operation}; call commit() on the pipeline to apply",
+        "session_id": pipeline.session_id,
+        "table_name": pipeline.table_name,
+        "pending_steps": len(pipeline)
+    }
+
 
 def rename_columns(
     session_id: str,
     mapping: Dict[str, str],
     table_name: str = "current",
     inplace: bool = False,
-    new_table_name: Optional[str] = None
+    new_table_name: Optional[str] = None,
+    pipeline: Optional[TransformationPipeline] = None
 ) -> Dict[str, Any]:
     """
     Rename one or more columns in a table.
@@ -28,11 +704,20 @@ def rename_columns(
         table_name: Name of the table (default: "current")
         inplace: If True, overwrite the existing table (default: False)
         new_table_name: Name for the renamed table (optional)
+        pipeline: Queue the rename on this pipeline instead of applying it;
+            the pipeline's commit target is used (optional)
     
     Returns:
         Dictionary with operation result
     """
     try:
+        if pipeline is not None:
+            error_response = _queue_on_pipeline(pipeline, session_id, table_name)
+            if error_response:
+                return error_response
+            pipeline.rename(mapping)
+            return _queued_response(pipeline, "rename_columns")
+
         df = get_table_data(session_id, table_name)
         if df is None:
             return {
@@ -41,33 +726,16 @@ def rename_columns(
             }
         
         original_columns = list(df.columns)
-        rows_before = len(df)
-        
-        # Validate mapping
-        invalid_cols = [old for old in mapping.keys() if old not in df.columns]
-        if invalid_cols:
-            return {
-                "success": False,
-                "error": f"Columns not found: {', '.join(invalid_cols)}"
-            }
+        # Renaming keeps the row count
+        row_count = len(df)
         
-        new_names = list(mapping.values())
-        if len(set(new_names)) != len(new_names):
-            return {
-                "success": False,
-                "error": "Duplicate new column names are not allowed"
-            }
-
-        existing_columns = set(df.columns) - set(mapping.keys())
-        conflicts = [name for name in new_names if name in existing_columns]
-        if conflicts:
+        # Rename columns
+        renamed_df, error = _rename_frame(df, mapping)
+        if error:
             return {
                 "success": False,
-                "error": f"New column names conflict with existing columns: {', '.join(conflicts)}"
+                "error": error
             }
-
-        # Rename columns
-        renamed_df = df.rename(columns=mapping)
         target_table = table_name if inplace else (new_table_name or f"{table_name}_renamed")
         
         # Commit changes
@@ -79,8 +747,8 @@ def rename_columns(
                 "original_columns": original_columns,
                 "new_columns": list(renamed_df.columns),
                 "target_table": target_table,
-                "rows_before": rows_before,
-                "rows_after": len(renamed_df)
+                "rows_before": row_count,
+                "rows_after": row_count
             })
             
             return {
@@ -90,7 +758,7 @@ def rename_columns(
                 "table_name": target_table,
                 "renamed_columns": mapping,
                 "new_columns": list(renamed_df.columns),
-                "preview": renamed_df.head(5).to_dict(orient="records")
+                "preview": _arrow_preview(renamed_df)
             }
         else:
             return {
@@ -110,7 +778,8 @@ def reorder_columns(
     session_id: str,
     columns: List[str],
     table_name: str = "current",
-    case_insensitive: bool = False
+    case_insensitive: bool = False,
+    pipeline: Optional[TransformationPipeline] = None
 ) -> Dict[str, Any]:
     """
     Reorder columns in a table.
@@ -120,11 +789,19 @@ def reorder_columns(
         columns: List of column names in desired order
         table_name: Name of the table (default: "current")
         case_insensitive: Match column names without case sensitivity (default: False)
+        pipeline: Queue the reorder on this pipeline instead of applying it (optional)
     
     Returns:
         Dictionary with operation result
     """
     try:
+        if pipeline is not None:
+            error_response = _queue_on_pipeline(pipeline, session_id, table_name)
+            if error_response:
+                return error_response
+            pipeline.reorder(columns, case_insensitive)
+            return _queued_response(pipeline, "reorder_columns")
+
         df = get_table_data(session_id, table_name)
         if df is None:
             return {
@@ -133,52 +810,16 @@ def reorder_columns(
             }
         
         original_columns = list(df.columns)
-        rows_before = len(df)
+        # Reordering keeps the row count
+        row_count = len(df)
         
-        if not columns:
-            return {
-                "success": False,
-                "error": "Columns list cannot be empty"
-            }
-
-        if case_insensitive:
-            lower_map = {}
-            for col in df.columns:
-                lower_col = col.lower()
-                if lower_col in lower_map:
-                    return {
-                        "success": False,
-                        "error": "Case-insensitive match is ambiguous for existing columns"
-                    }
-                lower_map[lower_col] = col
-            resolved_columns = []
-            for col in columns:
-                key = col.lower()
-                if key not in lower_map:
-                    return {
-                        "success": False,
-                        "error": f"Columns not found: {col}"
-                    }
-                resolved_columns.append(lower_map[key])
-        else:
-            resolved_columns = columns
-            missing_cols = [col for col in resolved_columns if col not in df.columns]
-            if missing_cols:
-                return {
-                    "success": False,
-                    "error": f"Columns not found: {', '.join(missing_cols)}"
-                }
-
-        if len(set(resolved_columns)) != len(resolved_columns):
+        df, error = _reorder_frame(df, columns, case_insensitive)
+        if error:
             return {
                 "success": False,
-                "error": "Duplicate columns in reorder list are not allowed"
+                "error": error
             }
-
-        # Allow partial reordering: append remaining columns at the end
-        remaining_columns = [col for col in df.columns if col not in resolved_columns]
-        new_order = resolved_columns + remaining_columns
-        df = df[new_order]
+        new_order = list(df.columns)
         
         # Commit changes
         if commit_dataframe(session_id, table_name, df):
@@ -187,17 +828,17 @@ def reorder_columns(
                 "type": "reorder_columns",
                 "original_order": original_columns,
                 "new_order": new_order,
-                "rows_before": rows_before,
-                "rows_after": len(df)
+                "rows_before": row_count,
+                "rows_after": row_count
             })
             
             return {
                 "success": True,
-                "message": f"Reordered {len(resolved_columns)} columns",
+                "message": f"Reordered {len(columns)} columns",
                 "session_id": session_id,
                 "table_name": table_name,
                 "new_column_order": new_order,
-                "preview": df.head(5).to_dict(orient="records")
+                "preview": _arrow_preview(df)
             }
         else:
             return {
@@ -219,7 +860,8 @@ def sort_data(
     ascending: Union[bool, List[bool]] = True,
     table_name: str = "current",
     na_position: str = "last",
-    reset_index: bool = False
+    reset_index: bool = False,
+    pipeline: Optional[TransformationPipeline] = None
 ) -> Dict[str, Any]:
     """
     Sort table by one or more columns.
@@ -231,11 +873,19 @@ def sort_data(
         table_name: Name of the table (default: "current")
         na_position: Position of NaNs - "first" or "last" (default: "last")
         reset_index: Reset index after sorting (default: False)
+        pipeline: Queue the sort on this pipeline instead of applying it (optional)
     
     Returns:
         Dictionary with operation result
     """
     try:
+        if pipeline is not None:
+            error_response = _queue_on_pipeline(pipeline, session_id, table_name)
+            if error_response:
+                return error_response
+            pipeline.sort(by, ascending, na_position, reset_index)
+            return _queued_response(pipeline, "sort_data")
+
         df = get_table_data(session_id, table_name)
         if df is None:
             return {
@@ -243,35 +893,16 @@ def sort_data(
                 "error": f"Table '{table_name}' not found in session {session_id}"
             }
         
-        # Validate columns exist
-        invalid_cols = [col for col in by if col not in df.columns]
-        if invalid_cols:
-            return {
-                "success": False,
-                "error": f"Columns not found: {', '.join(invalid_cols)}"
-            }
-        
-        if not by:
-            return {
-                "success": False,
-                "error": "Sort columns cannot be empty"
-            }
-        if isinstance(ascending, list) and len(ascending) != len(by):
-            return {
-                "success": False,
-                "error": "Ascending list length must match sort columns"
-            }
-        if na_position not in {"first", "last"}:
+        # Sorting keeps the row count
+        row_count = len(df)
+        error = _validate_sort(df, by, ascending, na_position)
+        if error:
             return {
                 "success": False,
-                "error": "na_position must be 'first' or 'last'"
+                "error": error
             }
-
-        rows_before = len(df)
-        # Sort the dataframe
-        df = df.sort_values(by=by, ascending=ascending, na_position=na_position)
-        if reset_index:
-            df = df.reset_index(drop=True)
+        already_sorted = _is_sorted(df, by, ascending)
+        df = _sort_rows(df, by, ascending, na_position, reset_index, already_sorted)
         
         # Commit changes
         if commit_dataframe(session_id, table_name, df):
@@ -282,8 +913,9 @@ def sort_data(
                 "ascending": ascending,
                 "na_position": na_position,
                 "reset_index": reset_index,
-                "rows_before": rows_before,
-                "rows_after": len(df)
+                "noop": already_sorted,
+                "rows_before": row_count,
+                "rows_after": row_count
             })
             
             return {
@@ -295,7 +927,7 @@ def sort_data(
                 "ascending": ascending,
                 "na_position": na_position,
                 "reset_index": reset_index,
-                "preview": df.head(5).to_dict(orient="records")
+                "preview": _arrow_preview(df)
             }
         else:
             return {
@@ -316,7 +948,8 @@ def apply_custom(
     column: str,
     function: str,
     new_column: Optional[str] = None,
-    table_name: str = "current"
+    table_name: str = "current",
+    pipeline: Optional[TransformationPipeline] = None
 ) -> Dict[str, Any]:
     """
     Apply a custom function to a column (whitelisted safe operations only).
@@ -327,11 +960,19 @@ def apply_custom(
         function: Allowed function name (e.g., "double", "strip", "lower")
         new_column: Name for new column (optional, overwrites original if not specified)
         table_name: Name of the table (default: "current")
+        pipeline: Queue the function on this pipeline instead of applying it (optional)
     
     Returns:
         Dictionary with operation result
     """
     try:
+        if pipeline is not None:
+            error_response = _queue_on_pipeline(pipeline, session_id, table_name)
+            if error_response:
+                return error_response
+            pipeline.apply(column, function, new_column)
+            return _queued_response(pipeline, "apply_custom")
+
         df = get_table_data(session_id, table_name)
         if df is None:
             return {
@@ -339,57 +980,15 @@ def apply_custom(
                 "error": f"Table '{table_name}' not found in session {session_id}"
             }
         
-        if column not in df.columns:
-            return {
-                "success": False,
-                "error": f"Column '{column}' not found in table"
-            }
-        
-        allowed_functions = {
-            "double": {"type": "numeric", "func": lambda s: s * 2},
-            "square": {"type": "numeric", "func": lambda s: s ** 2},
-            "abs": {"type": "numeric", "func": lambda s: s.abs()},
-            "round": {"type": "numeric", "func": lambda s: s.round()},
-            "strip": {"type": "string", "func": lambda s: s.astype(str).str.strip()},
-            "lower": {"type": "string", "func": lambda s: s.astype(str).str.lower()},
-            "upper": {"type": "string", "func": lambda s: s.astype(str).str.upper()},
-            "title": {"type": "string", "func": lambda s: s.astype(str).str.title()},
-            "to_string": {"type": "any", "func": lambda s: s.astype(str)}
-        }
-
-        if function not in allowed_functions:
-            return {
-                "success": False,
-                "error": f"Unsupported function. Allowed: {', '.join(sorted(allowed_functions.keys()))}"
-            }
-
-        func_spec = allowed_functions[function]
-        if func_spec["type"] == "numeric" and not pd.api.types.is_numeric_dtype(df[column]):
-            return {
-                "success": False,
-                "error": f"Function '{function}' requires a numeric column"
-            }
-        if func_spec["type"] == "string" and not pd.api.types.is_string_dtype(df[column]):
+        # Only one column is added or replaced, so the row count is unchanged
+        row_count = len(df)
+        df, error = _apply_frame(df, column, function, new_column)
+        if error:
             return {
                 "success": False,
-                "error": f"Function '{function}' requires a string column"
+                "error": error
             }
-
-        rows_before = len(df)
-        try:
-            result_series = func_spec["func"](df[column])
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to apply function: {str(e)}"
-            }
-
-        if new_column:
-            df[new_column] = result_series
-            result_column = new_column
-        else:
-            df[column] = result_series
-            result_column = column
+        result_column = new_column or column
         
         # Commit changes
         if commit_dataframe(session_id, table_name, df):
@@ -400,8 +999,8 @@ def apply_custom(
                 "function": function,
                 "new_column": new_column,
                 "result_column": result_column,
-                "rows_before": rows_before,
-                "rows_after": len(df)
+                "rows_before": row_count,
+                "rows_after": row_count
             })
             
             return {
@@ -412,7 +1011,7 @@ def apply_custom(
                 "source_column": column,
                 "result_column": result_column,
                 "function": function,
-                "preview": df.head(5).to_dict(orient="records")
+                "preview": _arrow_preview(df)
             }
         else:
             return {
@@ -456,9 +1055,13 @@ def set_index(
                 "error": f"Table '{table_name}' not found in session {session_id}"
             }
 
-        rows_before = len(df)
+        # Setting or resetting the index keeps the row count
+        row_count = len(df)
+        # Work on a shallow copy so the in-place index update neither copies
+        # the column data nor touches the stored table
+        updated_df = df.copy(deep=False)
         if reset:
-            updated_df = df.reset_index(drop=drop)
+            updated_df.reset_index(drop=drop, inplace=True)
             operation = "reset_index"
         else:
             if not columns:
@@ -472,7 +1075,7 @@ def set_index(
                     "success": False,
                     "error": f"Columns not found: {', '.join(missing_cols)}"
                 }
-            updated_df = df.set_index(columns, drop=drop)
+            updated_df.set_index(columns, drop=drop, append=False, inplace=True, verify_integrity=False)
             operation = "set_index"
 
         if commit_dataframe(session_id, table_name, updated_df):
@@ -480,15 +1083,15 @@ def set_index(
                 "type": operation,
                 "columns": columns,
                 "drop": drop,
-                "rows_before": rows_before,
-                "rows_after": len(updated_df)
+                "rows_before": row_count,
+                "rows_after": row_count
             })
             return {
                 "success": True,
                 "message": "Index updated",
                 "session_id": session_id,
                 "table_name": table_name,
-                "preview": updated_df.head(5).to_dict(orient="records")
+                "preview": _arrow_preview(updated_df)
             }
         return {
             "success": False,
@@ -542,13 +1145,19 @@ def pivot_table(
                 "error": f"Columns not found: {', '.join(missing)}"
             }
 
-        pivot_df = pd.pivot_table(
-            df,
-            index=index,
-            columns=columns,
-            values=values,
-            aggfunc=aggfunc
-        ).reset_index()
+        pivot_df = None
+        if _can_pivot_with_duckdb(df, index, columns, values, aggfunc):
+            pivot_df = _duckdb_pivot_table(df, index, columns, values, aggfunc)
+        if pivot_df is not None:
+            pivot_df = pivot_df.reset_index()
+        else:
+            pivot_df = pd.pivot_table(
+                df,
+                index=index,
+                columns=columns,
+                values=values,
+                aggfunc=aggfunc
+            ).reset_index()
 
         if commit_dataframe(session_id, table_name, pivot_df):
             _record_operation(session_id, table_name, {
@@ -564,7 +1173,7 @@ def pivot_table(
                 "message": "Created pivot table",
                 "session_id": session_id,
                 "table_name": table_name,
-                "preview": pivot_df.head(5).to_dict(orient="records")
+                "preview": _arrow_preview(pivot_df)
             }
         return {
             "success": False,
@@ -638,7 +1247,7 @@ def melt_unpivot(
                 "message": "Unpivoted table",
                 "session_id": session_id,
                 "table_name": table_name,
-                "preview": melted_df.head(5).to_dict(orient="records")
+                "preview": _arrow_preview(melted_df)
             }
         return {
             "success": False,
@@ -3,7 +3,7 @@ Data Visualization module for Data Assistant Platform.
 Provides chart generation and smart recommendations.
 """
 
-from .core.chart_generator import generate_chart
+from .core.chart_generator import generate_chart, cached_generate_chart, cached_generate_combo_chart
 from .core.data_fetcher import (
     get_dataframe_from_session,
     get_tables_from_session,
@@ -22,8 +22,10 @@ __all__ = [
     'invalidate_viz_cache',
     'on_data_changed',
     'generate_chart',
+    'cached_generate_chart',
     'ChartRecommendation',
     'get_chart_recommendations',
     'generate_combo_chart',
+    'cached_generate_combo_chart',
     'DashboardBuilder',
 ]
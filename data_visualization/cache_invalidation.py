@@ -18,6 +18,9 @@ _TABLES_CACHE_KEY = "viz_tables_cache"
 _DF_CACHE_KEY = "viz_df_cache"
 _FIG_CACHE_KEY = "viz_fig_cache"
 
+# Every hot-cache key (tables, DataFrames, memoized figures) starts with one of these
+_HOT_CACHE_PREFIXES = (_TABLES_CACHE_KEY, _DF_CACHE_KEY, _FIG_CACHE_KEY)
+
 
 def on_data_changed():
     """
@@ -38,18 +41,14 @@ def on_data_changed():
         st.session_state.get(_CACHE_VERSION_KEY, 0) + 1
     )
 
-    # Clear all hot-cache entries for tables and DataFrames
-    keys_to_delete = [
+    # Clear all hot-cache entries for tables, DataFrames and figures (Visualization
+    # Centre and memoized generate_chart) in one scan so charts regenerate with new data
+    stale_keys = [
         k for k in st.session_state
-        if k.startswith(_TABLES_CACHE_KEY)
-        or k.startswith(_DF_CACHE_KEY)
+        if k.startswith(_HOT_CACHE_PREFIXES)
     ]
-    for k in keys_to_delete:
-        del st.session_state[k]
-
-    # Clear figure cache so charts regenerate with new data
-    if _FIG_CACHE_KEY in st.session_state:
-        del st.session_state[_FIG_CACHE_KEY]
+    for k in stale_keys:
+        st.session_state.pop(k, None)
 
 
 def get_cache_stats() -> dict:
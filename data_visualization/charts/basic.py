@@ -2,12 +2,181 @@
 Basic chart types: bar, line, scatter, area, box, histogram, pie.
 """
 
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from typing import Optional
+import plotly.io as pio
+from plotly.colors import qualitative
+from typing import Optional, Tuple
 
-from ..utils import create_error_figure
+from ..utils import create_error_figure, plotly_express
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+_BAR_COUNT_TOP_N = 20
+_PIE_MAX_SLICES = 50
+
+# Uncolored numeric histograms at least this long are binned here and sent as
+# ~30 bars instead of shipping every raw value for plotly.js to bin
+_HISTOGRAM_PREBIN_MIN_ROWS = 10_000
+_HISTOGRAM_BINS = 30
+
+# Same threshold as px's render_mode='auto'
+_WEBGL_MIN_ROWS = 1000
+
+if njit is not None:
+    @njit(cache=True)
+    def _bin_counts_kernel(values, nbins, lo, hi):
+        counts = np.zeros(nbins, dtype=np.int64)
+        scale = nbins / (hi - lo)
+        for i in range(values.size):
+            idx = int((values[i] - lo) * scale)
+            # The right edge belongs to the last bin, as in np.histogram
+            if idx >= nbins:
+                idx = nbins - 1
+            counts[idx] += 1
+        return counts
+else:
+    _bin_counts_kernel = None
+
+
+def _histogram_counts(values: np.ndarray, nbins: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Equal-width bin edges and counts for finite values (numba kernel when available)."""
+    lo, hi = float(values.min()), float(values.max())
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    edges = np.linspace(lo, hi, nbins + 1)
+    if _bin_counts_kernel is not None:
+        return edges, _bin_counts_kernel(values.astype(np.float64, copy=False), nbins, lo, hi)
+    return edges, np.histogram(values, bins=edges)[0]
+
+
+def _prebinned_histogram(
+    series: pd.Series,
+    x_col: str,
+    title: str,
+    color_palette: Optional[list],
+) -> Optional[go.Figure]:
+    """Histogram as a go.Bar of precomputed bins; None if there is nothing finite to bin."""
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    values = values[np.isfinite(values)]
+    if not values.size:
+        return None
+    edges, counts = _histogram_counts(values, _HISTOGRAM_BINS)
+    return go.Figure(
+        go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
+            name=x_col,
+            marker_color=color_palette[0] if color_palette else None,
+            hovertemplate=f"{x_col}=%{{x}}<br>count=%{{y}}<extra></extra>",
+        ),
+        layout={
+            "title": {"text": title},
+            "bargap": 0,
+            "xaxis": {"title": {"text": x_col}},
+            "yaxis": {"title": {"text": "count"}},
+        },
+    )
+
+
+def _pie_figure(
+    counts: pd.Series,
+    label_col: str,
+    title: str,
+    color_palette: Optional[list],
+) -> go.Figure:
+    """
+    Pie of per-category counts built directly with go.Pie from numpy arrays,
+    skipping px.pie's DataFrame round-trip. Mirrors px.pie's hover and legend.
+    """
+    layout = {"title": {"text": title}, "legend": {"tracegroupgap": 0}}
+    if color_palette:
+        layout["piecolorway"] = color_palette
+    return go.Figure(
+        go.Pie(
+            labels=counts.index.to_numpy(),
+            values=counts.to_numpy(),
+            hovertemplate=f"{label_col}=%{{label}}<br>count=%{{value}}<extra></extra>",
+            showlegend=True,
+        ),
+        layout=layout,
+    )
+
+
+# Uncolored xy charts are built directly as go traces (see _xy_figure);
+# per chart type: trace properties px.<type> would set without a color column
+_XY_TRACE_STYLES = {
+    'bar': {
+        'type': 'bar', 'orientation': 'v', 'textposition': 'auto',
+        'marker': {'pattern': {'shape': ''}},
+    },
+    'line': {
+        'type': 'scatter', 'orientation': 'v', 'mode': 'lines',
+        'line': {'dash': 'solid'}, 'marker': {'symbol': 'circle'},
+    },
+    'scatter': {
+        'type': 'scatter', 'orientation': 'v', 'mode': 'markers',
+        'marker': {'symbol': 'circle'},
+    },
+    'area': {
+        'type': 'scatter', 'orientation': 'v', 'mode': 'lines', 'stackgroup': '1',
+        'fillpattern': {'shape': ''}, 'line': {}, 'marker': {'symbol': 'circle'},
+    },
+}
+
+
+def _default_trace_color() -> str:
+    """First colorway color of the active default template (px's default sequence)."""
+    template = pio.templates[pio.templates.default] if pio.templates.default else None
+    colorway = template.layout.colorway if template is not None else None
+    return colorway[0] if colorway else qualitative.D3[0]
+
+
+def _xy_figure(
+    chart_type: str,
+    df_agg: pd.DataFrame,
+    x_col: str,
+    y_col: str,
+    title: str,
+    color_palette: Optional[list],
+) -> go.Figure:
+    """
+    Single-trace bar/line/scatter/area chart built directly with go from numpy
+    arrays. Without a color column px only adds its groupby and ordering passes;
+    this mirrors the figure px.<chart_type> produces in that case.
+    """
+    style = _XY_TRACE_STYLES[chart_type]
+    trace = {
+        **style,
+        'x': df_agg[x_col].to_numpy(),
+        'y': df_agg[y_col].to_numpy(),
+        'name': '', 'legendgroup': '', 'showlegend': False,
+        'xaxis': 'x', 'yaxis': 'y',
+        'hovertemplate': f"{x_col}=%{{x}}<br>{y_col}=%{{y}}<extra></extra>",
+    }
+    color = color_palette[0] if color_palette else _default_trace_color()
+    if chart_type in ('line', 'area'):
+        trace['line'] = {**style['line'], 'color': color}
+    else:
+        trace['marker'] = {**style['marker'], 'color': color}
+    if chart_type in ('line', 'scatter') and len(df_agg) > _WEBGL_MIN_ROWS:
+        # px's render_mode='auto' switches to WebGL past 1000 rows
+        trace['type'] = 'scattergl'
+        del trace['orientation']
+    layout = {
+        "title": {"text": title},
+        "legend": {"tracegroupgap": 0},
+        "xaxis": {"anchor": "y", "domain": [0.0, 1.0], "title": {"text": x_col}},
+        "yaxis": {"anchor": "x", "domain": [0.0, 1.0], "title": {"text": y_col}},
+    }
+    if chart_type == 'bar':
+        layout["barmode"] = "relative"
+    return go.Figure(data=[trace], layout=layout)
 
 
 def generate_basic_chart(
@@ -25,20 +194,25 @@ def generate_basic_chart(
     """
     # Normalize 'None' string from UI
     color_opt = color_col if color_col and color_col != 'None' else None
+    cols = frozenset(df_agg.columns)
 
     if chart_type == 'bar':
-        if y_col and y_col in df_agg.columns and x_col and x_col in df_agg.columns:
-            fig = px.bar(
-                df_agg,
-                x=x_col,
-                y=y_col,
-                color=color_opt,
-                title=title_override or f"Bar Chart: {y_col} by {x_col}",
-                color_discrete_sequence=color_palette
-            )
-        elif x_col and x_col in df_agg.columns:
-            value_counts = df_agg[x_col].value_counts().head(20)
-            fig = px.bar(
+        if y_col and y_col in cols and x_col and x_col in cols:
+            title = title_override or f"Bar Chart: {y_col} by {x_col}"
+            if color_opt is None:
+                fig = _xy_figure('bar', df_agg, x_col, y_col, title, color_palette)
+            else:
+                fig = plotly_express().bar(
+                    df_agg,
+                    x=x_col,
+                    y=y_col,
+                    color=color_opt,
+                    title=title,
+                    color_discrete_sequence=color_palette
+                )
+        elif x_col and x_col in cols:
+            value_counts = df_agg[x_col].value_counts(sort=False).nlargest(_BAR_COUNT_TOP_N)
+            fig = plotly_express().bar(
                 x=value_counts.index,
                 y=value_counts.values,
                 title=title_override or f"Bar Chart: Count by {x_col}",
@@ -50,49 +224,61 @@ def generate_basic_chart(
             )
 
     elif chart_type == 'line':
-        if y_col and y_col in df_agg.columns and x_col and x_col in df_agg.columns:
-            fig = px.line(
-                df_agg,
-                x=x_col,
-                y=y_col,
-                color=color_opt,
-                title=title_override or f"Line Chart: {y_col} over {x_col}",
-                color_discrete_sequence=color_palette
-            )
+        if y_col and y_col in cols and x_col and x_col in cols:
+            title = title_override or f"Line Chart: {y_col} over {x_col}"
+            if color_opt is None:
+                fig = _xy_figure('line', df_agg, x_col, y_col, title, color_palette)
+            else:
+                fig = plotly_express().line(
+                    df_agg,
+                    x=x_col,
+                    y=y_col,
+                    color=color_opt,
+                    title=title,
+                    color_discrete_sequence=color_palette
+                )
         else:
             fig = create_error_figure("Line chart requires both X and Y columns")
 
     elif chart_type == 'scatter':
-        if y_col and y_col in df_agg.columns and x_col and x_col in df_agg.columns:
-            fig = px.scatter(
-                df_agg,
-                x=x_col,
-                y=y_col,
-                color=color_opt,
-                title=title_override or f"Scatter: {y_col} vs {x_col}",
-                color_discrete_sequence=color_palette
-            )
+        if y_col and y_col in cols and x_col and x_col in cols:
+            title = title_override or f"Scatter: {y_col} vs {x_col}"
+            if color_opt is None:
+                fig = _xy_figure('scatter', df_agg, x_col, y_col, title, color_palette)
+            else:
+                fig = plotly_express().scatter(
+                    df_agg,
+                    x=x_col,
+                    y=y_col,
+                    color=color_opt,
+                    title=title,
+                    color_discrete_sequence=color_palette
+                )
         else:
             fig = create_error_figure(
                 f"Scatter chart requires both X and Y columns. Available columns: {list(df_agg.columns)}"
             )
 
     elif chart_type == 'area':
-        if y_col and y_col in df_agg.columns and x_col and x_col in df_agg.columns:
-            fig = px.area(
-                df_agg,
-                x=x_col,
-                y=y_col,
-                color=color_opt,
-                title=title_override or f"Area Chart: {y_col} over {x_col}",
-                color_discrete_sequence=color_palette
-            )
+        if y_col and y_col in cols and x_col and x_col in cols:
+            title = title_override or f"Area Chart: {y_col} over {x_col}"
+            if color_opt is None:
+                fig = _xy_figure('area', df_agg, x_col, y_col, title, color_palette)
+            else:
+                fig = plotly_express().area(
+                    df_agg,
+                    x=x_col,
+                    y=y_col,
+                    color=color_opt,
+                    title=title,
+                    color_discrete_sequence=color_palette
+                )
         else:
             fig = create_error_figure("Area chart requires both X and Y columns")
 
     elif chart_type == 'box':
-        if y_col and y_col in df_agg.columns:
-            fig = px.box(
+        if y_col and y_col in cols:
+            fig = plotly_express().box(
                 df_agg,
                 x=x_col if x_col and x_col != 'None' else None,
                 y=y_col,
@@ -106,36 +292,50 @@ def generate_basic_chart(
             fig = create_error_figure("Box plot requires Y column")
 
     elif chart_type == 'histogram':
-        if x_col and x_col in df_agg.columns:
-            fig = px.histogram(
-                df_agg,
-                x=x_col,
-                color=color_opt,
-                title=title_override or f"Histogram: Distribution of {x_col}",
-                color_discrete_sequence=color_palette
-            )
+        if x_col and x_col in cols:
+            title = title_override or f"Histogram: Distribution of {x_col}"
+            fig = None
+            if (
+                color_opt is None
+                and len(df_agg) >= _HISTOGRAM_PREBIN_MIN_ROWS
+                and df_agg[x_col].dtype.kind in "iuf"
+            ):
+                fig = _prebinned_histogram(df_agg[x_col], x_col, title, color_palette)
+            if fig is None:
+                fig = plotly_express().histogram(
+                    df_agg,
+                    x=x_col,
+                    color=color_opt,
+                    title=title,
+                    color_discrete_sequence=color_palette
+                )
         else:
             fig = create_error_figure(
                 f"Histogram requires X column. Available columns: {list(df_agg.columns)}"
             )
 
     elif chart_type == 'pie':
-        if y_col and y_col in df_agg.columns:
-            df_pie = df_agg.groupby(y_col).size().reset_index(name='count')
-            fig = px.pie(
-                df_pie,
-                values='count',
-                names=y_col,
-                title=title_override or f"Pie: Distribution of {y_col}",
-                color_discrete_sequence=color_palette
+        if y_col and y_col in cols:
+            # One hash pass, no GroupBy or categorical conversion; slices keep
+            # first-appearance order
+            counts = df_agg[y_col].value_counts(sort=False)
+            if isinstance(counts.index, pd.CategoricalIndex):
+                # Categoricals also count unused categories; drop the empty slices
+                counts = counts[counts.to_numpy() > 0]
+            fig = _pie_figure(
+                counts,
+                y_col,
+                title_override or f"Pie: Distribution of {y_col}",
+                color_palette,
             )
-        elif x_col and x_col in df_agg.columns:
-            value_counts = df_agg[x_col].value_counts()
-            fig = px.pie(
-                values=value_counts.values,
-                names=value_counts.index,
-                title=title_override or f"Pie: Distribution of {x_col}",
-                color_discrete_sequence=color_palette
+        elif x_col and x_col in cols:
+            # Beyond ~50 slices a pie is unreadable; keep the largest ones
+            value_counts = df_agg[x_col].value_counts(sort=False).nlargest(_PIE_MAX_SLICES)
+            fig = _pie_figure(
+                value_counts,
+                x_col,
+                title_override or f"Pie: Distribution of {x_col}",
+                color_palette,
             )
         else:
             fig = create_error_figure("Pie chart requires at least one column")
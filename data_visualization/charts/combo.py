@@ -2,31 +2,222 @@
 Combo charts with dual y-axes and color grouping.
 """
 
+from functools import lru_cache
+
+import numpy as np
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
-import plotly.express as px
-from typing import Optional
+from plotly.colors import qualitative, sequential
+from typing import Optional, Union
+
+from ..utils import create_error_figure, _lttb, _theme_template
 
-from ..utils import create_error_figure, apply_theme
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
 
 
-def _get_color_palette(color_scheme: str = 'plotly', n_colors: int = 10):
-    """Get color palette from Plotly color schemes."""
+@lru_cache(maxsize=64)
+def _get_color_palette(color_scheme: str = 'plotly', n_colors: int = 10) -> tuple:
+    """Get color palette from Plotly color schemes, cycled to ``n_colors`` entries."""
     try:
-        if hasattr(px.colors.qualitative, color_scheme.upper()):
-            palette = getattr(px.colors.qualitative, color_scheme.upper())
-        elif hasattr(px.colors.sequential, color_scheme.upper()):
-            palette = getattr(px.colors.sequential, color_scheme.upper())
+        if hasattr(qualitative, color_scheme.upper()):
+            palette = getattr(qualitative, color_scheme.upper())
+        elif hasattr(sequential, color_scheme.upper()):
+            palette = getattr(sequential, color_scheme.upper())
         else:
-            palette = px.colors.qualitative.Plotly
+            palette = qualitative.Plotly
         if n_colors > len(palette):
             palette = (palette * ((n_colors // len(palette)) + 1))[:n_colors]
         else:
             palette = palette[:n_colors]
-        return palette
-    except Exception:
-        return px.colors.qualitative.Plotly[:n_colors]
+        return tuple(palette)
+    except (AttributeError, TypeError):
+        # Non-string scheme name or non-integer count
+        return tuple(qualitative.Plotly[:n_colors])
+
+
+def _arrow_to_pandas(data, columns) -> pd.DataFrame:
+    """
+    Convert an Arrow-capable frame (polars DataFrame, pyarrow Table, anything
+    exposing ``__arrow_c_stream__``) to pandas, importing it zero-copy through
+    the Arrow C stream and converting only the requested columns that exist.
+    """
+    table = pa.table(data)
+    present = set(table.column_names)
+    return table.select([c for c in dict.fromkeys(columns) if c in present]).to_pandas()
+
+
+# Combo chart input: pandas, or any Arrow-capable frame (pyarrow Table, polars DataFrame)
+ComboData = Union[pd.DataFrame, "pa.Table"]
+
+
+def _combo_frame(data: ComboData, x_col, y1_col, y2_col, color_col) -> Optional[pd.DataFrame]:
+    """
+    Return ``data`` as a pandas DataFrame for the combo chart. Arrow-capable
+    input (polars / pyarrow) is converted keeping only the plotted columns;
+    None if such input arrives without pyarrow installed. Anything else is
+    returned unchanged.
+    """
+    if isinstance(data, pd.DataFrame) or not hasattr(data, '__arrow_c_stream__'):
+        return data
+    if pa is None:
+        return None
+    return _arrow_to_pandas(data, [c for c in (x_col, y1_col, y2_col, color_col) if c])
+
+
+# Above this magnitude float32 spacing (~0.008 at 2**16) is too coarse for the
+# 2-decimal hover labels, so such columns skip the downcast attempt outright
+_FLOAT32_SAFE_MAX = 2.0 ** 16
+
+# Decimals shown by the combo hover templates (%{y:,.2f})
+_HOVER_DECIMALS = 2
+
+
+def _to_plot_dtype(values: np.ndarray) -> np.ndarray:
+    """
+    Downcast float64 trace values to float32 when every value still rounds to
+    the same 2-decimal hover label; plotly base64-encodes ndarrays, so this
+    halves the payload. Values near a rounding tie (12.345 is 12.34499... in
+    float64 but 12.3450003 in float32) keep float64. Integer, datetime and
+    object arrays are returned unchanged.
+    """
+    if values.dtype != np.float64 or not len(values):
+        return values
+    finite = np.abs(values[np.isfinite(values)])
+    if finite.size and finite.max() > _FLOAT32_SAFE_MAX:
+        return values
+    downcast = values.astype(np.float32)
+    if not np.array_equal(
+        np.round(downcast.astype(np.float64), _HOVER_DECIMALS),
+        np.round(values, _HOVER_DECIMALS),
+        equal_nan=True,
+    ):
+        return values
+    return downcast
+
+
+# Traces are built as plain dicts with a fixed, known-valid key set and passed
+# to go.Figure in one call (see generate_combo_chart).
+# Trace styling: (line width, line marker size, scatter marker size,
+# scatter outline width, area line width). Thinner when split by color.
+_TRACE_SIZES = {
+    True: (2.5, 7, 9, 1, 2),
+    False: (3, 8, 10, 1.5, 2.5),
+}
+
+
+def _bar_trace(x, y, name, color, opacity, hovertemplate, sizes, secondary, grouped):
+    return {
+        'type': 'bar', 'x': x, 'y': y, 'name': name, 'marker': {'color': color},
+        'opacity': opacity, 'hovertemplate': hovertemplate,
+    }
+
+
+def _line_trace(x, y, name, color, opacity, hovertemplate, sizes, secondary, grouped):
+    line = {'color': color, 'width': sizes[0]}
+    marker = {'size': sizes[1], 'color': color, 'opacity': opacity}
+    if secondary:
+        line['dash'] = 'dash'
+        marker['symbol'] = 'diamond'
+    return {
+        'type': 'scatter', 'x': x, 'y': y, 'name': name, 'mode': 'lines+markers',
+        'line': line, 'marker': marker, 'hovertemplate': hovertemplate,
+    }
+
+
+def _scatter_trace(x, y, name, color, opacity, hovertemplate, sizes, secondary, grouped):
+    marker = {
+        'color': color, 'size': sizes[2], 'opacity': opacity,
+        'line': {'width': sizes[3], 'color': 'white'},
+    }
+    if secondary:
+        marker['symbol'] = 'diamond'
+    return {
+        'type': 'scatter', 'x': x, 'y': y, 'name': name, 'mode': 'markers',
+        'marker': marker, 'hovertemplate': hovertemplate,
+    }
+
+
+def _area_trace(x, y, name, color, opacity, hovertemplate, sizes, secondary, grouped):
+    line = {'color': color, 'width': sizes[4]}
+    if secondary:
+        line['dash'] = 'dot'
+    return {
+        'type': 'scatter', 'x': x, 'y': y, 'name': name, 'mode': 'lines', 'fill': 'tozeroy',
+        'line': line, 'opacity': opacity * 0.7, 'hovertemplate': hovertemplate,
+    }
+
+
+def _primary_fallback_trace(x, y, name, color, opacity, hovertemplate, sizes, secondary, grouped):
+    """Unknown left-axis type: plain bars (per-group bars keep full opacity)."""
+    trace = {'type': 'bar', 'x': x, 'y': y, 'name': name, 'marker': {'color': color}}
+    if not grouped:
+        trace['opacity'] = opacity
+    return trace
+
+
+def _secondary_fallback_trace(x, y, name, color, opacity, hovertemplate, sizes, secondary, grouped):
+    """Unknown right-axis type: a dashed line."""
+    return {
+        'type': 'scatter', 'x': x, 'y': y, 'name': name, 'mode': 'lines',
+        'line': {'color': color, 'dash': 'dash'},
+    }
+
+
+# Axis references set on each trace: left-axis traces plot against yaxis,
+# right-axis traces against the overlaying yaxis2
+_PRIMARY_AXIS_REFS = {'xaxis': 'x', 'yaxis': 'y'}
+_SECONDARY_AXIS_REFS = {'xaxis': 'x', 'yaxis': 'y2'}
+
+
+# Chart type -> trace factory, resolved once per chart instead of per trace
+_TRACE_BUILDERS = {
+    'bar': _bar_trace,
+    'line': _line_trace,
+    'scatter': _scatter_trace,
+    'area': _area_trace,
+}
+
+
+# Marker-only (scatter) axes split into at least this many color groups are
+# drawn as one trace with per-point colors instead of a trace per group;
+# plotly.js hover and redraw cost grows with the trace count
+_COLLAPSE_SCATTER_MIN_GROUPS = 20
+
+
+def _collapsed_scatter_series(groups, colors, y_pos, y_col, color_col, hover_group):
+    """
+    Series for a grouped marker-only axis as a single trace: points of every
+    group concatenated, colored per point, with the group label carried in
+    customdata for the hover. The trace has one legend entry, which toggles
+    all of its points; groups are not listed in the legend, since entries
+    there could not hide a group's points. Lines, areas and bars keep a trace
+    per group, since a single trace would join or stack them across groups.
+    """
+    labels = [group[0] for group in groups]
+    lengths = [len(group[1]) for group in groups]
+    return [(
+        np.concatenate([group[1] for group in groups]),
+        np.concatenate([group[y_pos] for group in groups]),
+        f"{y_col} (by {color_col})",
+        np.repeat(np.array(colors, dtype=object), lengths),
+        hover_group + "%{customdata}<br><extra></extra>",
+        {'customdata': np.repeat(np.array(labels, dtype=object), lengths)},
+    )]
+
+
+def _collapsed_groups_note(y_cols, color_col, n_groups) -> dict:
+    """
+    Annotation below the plot explaining per-point colors on collapsed
+    scatter axes, which the legend does not break down by group.
+    """
+    return dict(
+        text=f"{' and '.join(y_cols)} points colored by {color_col} ({n_groups} groups; hover for the group)",
+        xref='paper', yref='paper', x=0, y=0, xanchor='left', yanchor='top',
+        yshift=-50, showarrow=False, font=dict(size=11, color='#555555'),
+    )
 
 
 def _format_number(value):
@@ -45,7 +236,7 @@ def _format_number(value):
 
 
 def generate_combo_chart(
-    df: pd.DataFrame,
+    df: ComboData,
     x_col: str,
     y1_col: str,
     y2_col: str,
@@ -59,199 +250,169 @@ def generate_combo_chart(
     """
     Generate combo chart with dual y-axes.
     Combines two different chart types (e.g., bar + line) on the same plot.
+    Accepts a pandas DataFrame or any Arrow-capable frame (pyarrow Table,
+    polars DataFrame); the latter is converted keeping only the plotted columns.
     """
+    # polars / pyarrow input: hand over only the plotted columns instead of
+    # materializing the whole frame in pandas
+    df = _combo_frame(df, x_col, y1_col, y2_col, color_col)
+    if df is None:
+        return create_error_figure("pyarrow is required to plot Arrow-backed data")
     if df.empty:
         return create_error_figure("No data available for combo chart")
-    if x_col not in df.columns:
+    cols = frozenset(df.columns)
+    if x_col not in cols:
         return create_error_figure(f"X column '{x_col}' not found in data")
-    if y1_col not in df.columns:
+    if y1_col not in cols:
         return create_error_figure(f"Y1 column '{y1_col}' not found in data")
-    if y2_col not in df.columns:
+    if y2_col not in cols:
         return create_error_figure(f"Y2 column '{y2_col}' not found in data")
-    if color_col and color_col not in df.columns:
+    if color_col and color_col not in cols:
         return create_error_figure(f"Color column '{color_col}' not found in data")
 
     opacity1 = max(0.1, min(1.0, opacity1))
     opacity2 = max(0.1, min(1.0, opacity2))
 
-    fig = make_subplots(specs=[[{"secondary_y": True}]])
-
+    # Traces get plain ndarrays, extracted once per column up front, so
+    # plotly's validators skip Series introspection and groups are plain
+    # integer-position slices of contiguous arrays.
+    x_arr = df[x_col].to_numpy()
+    y1_arr = df[y1_col].to_numpy()
+    y2_arr = df[y2_col].to_numpy()
     if color_col:
-        unique_groups = df[color_col].nunique()
-        colors = _get_color_palette(color_scheme, unique_groups)
-        group_values = sorted(df[color_col].dropna().unique())
-    else:
-        colors = _get_color_palette(color_scheme, 2)
-        group_values = [None]
-
-    if color_col:
-        grouped_data = df.groupby([x_col, color_col], dropna=False)
-    else:
-        grouped_data = None
-
-    # First trace (left y-axis)
-    if color_col and grouped_data is not None:
-        for idx, group_val in enumerate(group_values):
-            if pd.isna(group_val):
-                group_df = df[df[color_col].isna()]
-            else:
-                group_df = df[df[color_col] == group_val]
-            if group_df.empty:
-                continue
-            color = colors[idx % len(colors)]
-            trace_name = f"{y1_col} ({group_val})" if group_val is not None else f"{y1_col} (N/A)"
-            if chart1_type == 'bar':
-                trace1 = go.Bar(
-                    x=group_df[x_col], y=group_df[y1_col], name=trace_name,
-                    marker_color=color, opacity=opacity1,
-                    hovertemplate=f"<b>{x_col}</b>: %{{x}}<br><b>{y1_col}</b>: %{{y:,.2f}}<br><b>{color_col}</b>: {group_val}<br><extra></extra>"
-                )
-            elif chart1_type == 'line':
-                trace1 = go.Scatter(
-                    x=group_df[x_col], y=group_df[y1_col], name=trace_name,
-                    mode='lines+markers', line=dict(color=color, width=2.5),
-                    marker=dict(size=7, color=color, opacity=opacity1),
-                    hovertemplate=f"<b>{x_col}</b>: %{{x}}<br><b>{y1_col}</b>: %{{y:,.2f}}<br><b>{color_col}</b>: {group_val}<br><extra></extra>"
-                )
-            elif chart1_type == 'scatter':
-                trace1 = go.Scatter(
-                    x=group_df[x_col], y=group_df[y1_col], name=trace_name, mode='markers',
-                    marker=dict(color=color, size=9, opacity=opacity1, line=dict(width=1, color='white')),
-                    hovertemplate=f"<b>{x_col}</b>: %{{x}}<br><b>{y1_col}</b>: %{{y:,.2f}}<br><b>{color_col}</b>: {group_val}<br><extra></extra>"
-                )
-            elif chart1_type == 'area':
-                trace1 = go.Scatter(
-                    x=group_df[x_col], y=group_df[y1_col], name=trace_name, mode='lines', fill='tozeroy',
-                    line=dict(color=color, width=2), opacity=opacity1 * 0.7,
-                    hovertemplate=f"<b>{x_col}</b>: %{{x}}<br><b>{y1_col}</b>: %{{y:,.2f}}<br><b>{color_col}</b>: {group_val}<br><extra></extra>"
-                )
-            else:
-                trace1 = go.Bar(x=group_df[x_col], y=group_df[y1_col], name=trace_name, marker_color=color)
-            fig.add_trace(trace1, secondary_y=False)
-    else:
-        color1 = colors[0] if len(colors) > 0 else '#1f77b4'
-        if chart1_type == 'bar':
-            trace1 = go.Bar(
-                x=df[x_col], y=df[y1_col], name=y1_col,
-                marker_color=color1, opacity=opacity1,
-                hovertemplate=f"<b>{x_col}</b>: %{{x}}<br><b>{y1_col}</b>: %{{y:,.2f}}<br><extra></extra>"
-            )
-        elif chart1_type == 'line':
-            trace1 = go.Scatter(
-                x=df[x_col], y=df[y1_col], name=y1_col, mode='lines+markers',
-                line=dict(color=color1, width=3), marker=dict(size=8, color=color1, opacity=opacity1),
-                hovertemplate=f"<b>{x_col}</b>: %{{x}}<br><b>{y1_col}</b>: %{{y:,.2f}}<br><extra></extra>"
-            )
-        elif chart1_type == 'scatter':
-            trace1 = go.Scatter(
-                x=df[x_col], y=df[y1_col], name=y1_col, mode='markers',
-                marker=dict(color=color1, size=10, opacity=opacity1, line=dict(width=1.5, color='white')),
-                hovertemplate=f"<b>{x_col}</b>: %{{x}}<br><b>{y1_col}</b>: %{{y:,.2f}}<br><extra></extra>"
-            )
-        elif chart1_type == 'area':
-            trace1 = go.Scatter(
-                x=df[x_col], y=df[y1_col], name=y1_col, mode='lines', fill='tozeroy',
-                line=dict(color=color1, width=2.5), opacity=opacity1 * 0.7,
-                hovertemplate=f"<b>{x_col}</b>: %{{x}}<br><b>{y1_col}</b>: %{{y:,.2f}}<br><extra></extra>"
-            )
+        # Partition once into integer row positions per group (.indices only
+        # hashes the color column; no sub-DataFrames are built), giving
+        # (label, x, y1, y2) per group for both trace loops. groupby never
+        # yields empty groups (observed=True, NaN keys dropped), so every
+        # entry gets traces; the label string is formatted once per group.
+        positions = df.groupby(color_col, sort=True, observed=True).indices
+        # The same pass tells whether the column is constant (one group covering
+        # every row, or all NaN); then it splits nothing and the plain
+        # two-trace chart is drawn instead of one single-member group per axis
+        if not positions or (
+            len(positions) == 1 and len(next(iter(positions.values()))) == len(x_arr)
+        ):
+            color_col = None
         else:
-            trace1 = go.Bar(x=df[x_col], y=df[y1_col], name=y1_col, marker_color=color1, opacity=opacity1)
-        fig.add_trace(trace1, secondary_y=False)
-
-    # Second trace (right y-axis)
-    if color_col and grouped_data is not None:
-        for idx, group_val in enumerate(group_values):
-            if pd.isna(group_val):
-                group_df = df[df[color_col].isna()]
-            else:
-                group_df = df[df[color_col] == group_val]
-            if group_df.empty:
-                continue
-            color = colors[(idx + len(colors) // 2) % len(colors)] if len(colors) > 1 else colors[0]
-            trace_name = f"{y2_col} ({group_val})" if group_val is not None else f"{y2_col} (N/A)"
-            if chart2_type == 'bar':
-                trace2 = go.Bar(
-                    x=group_df[x_col], y=group_df[y2_col], name=trace_name,
-                    marker_color=color, opacity=opacity2,
-                    hovertemplate=f"<b>{x_col}</b>: %{{x}}<br><b>{y2_col}</b>: %{{y:,.2f}}<br><b>{color_col}</b>: {group_val}<br><extra></extra>"
-                )
-            elif chart2_type == 'line':
-                trace2 = go.Scatter(
-                    x=group_df[x_col], y=group_df[y2_col], name=trace_name, mode='lines+markers',
-                    line=dict(color=color, width=2.5, dash='dash'),
-                    marker=dict(size=7, color=color, opacity=opacity2, symbol='diamond'),
-                    hovertemplate=f"<b>{x_col}</b>: %{{x}}<br><b>{y2_col}</b>: %{{y:,.2f}}<br><b>{color_col}</b>: {group_val}<br><extra></extra>"
-                )
-            elif chart2_type == 'scatter':
-                trace2 = go.Scatter(
-                    x=group_df[x_col], y=group_df[y2_col], name=trace_name, mode='markers',
-                    marker=dict(color=color, size=9, opacity=opacity2, symbol='diamond', line=dict(width=1, color='white')),
-                    hovertemplate=f"<b>{x_col}</b>: %{{x}}<br><b>{y2_col}</b>: %{{y:,.2f}}<br><b>{color_col}</b>: {group_val}<br><extra></extra>"
+            groups = [
+                (
+                    str(group_val),
+                    x_arr[rows],
+                    _to_plot_dtype(y1_arr[rows]),
+                    _to_plot_dtype(y2_arr[rows]),
                 )
-            elif chart2_type == 'area':
-                trace2 = go.Scatter(
-                    x=group_df[x_col], y=group_df[y2_col], name=trace_name, mode='lines', fill='tozeroy',
-                    line=dict(color=color, width=2, dash='dot'), opacity=opacity2 * 0.7,
-                    hovertemplate=f"<b>{x_col}</b>: %{{x}}<br><b>{y2_col}</b>: %{{y:,.2f}}<br><b>{color_col}</b>: {group_val}<br><extra></extra>"
-                )
-            else:
-                trace2 = go.Scatter(x=group_df[x_col], y=group_df[y2_col], name=trace_name, mode='lines', line=dict(color=color, dash='dash'))
-            fig.add_trace(trace2, secondary_y=True)
-    else:
-        color2 = colors[1] if len(colors) > 1 else '#ff7f0e'
-        if chart2_type == 'bar':
-            trace2 = go.Bar(
-                x=df[x_col], y=df[y2_col], name=y2_col,
-                marker_color=color2, opacity=opacity2,
-                hovertemplate=f"<b>{x_col}</b>: %{{x}}<br><b>{y2_col}</b>: %{{y:,.2f}}<br><extra></extra>"
-            )
-        elif chart2_type == 'line':
-            trace2 = go.Scatter(
-                x=df[x_col], y=df[y2_col], name=y2_col, mode='lines+markers',
-                line=dict(color=color2, width=3, dash='dash'),
-                marker=dict(size=8, color=color2, opacity=opacity2, symbol='diamond'),
-                hovertemplate=f"<b>{x_col}</b>: %{{x}}<br><b>{y2_col}</b>: %{{y:,.2f}}<br><extra></extra>"
-            )
-        elif chart2_type == 'scatter':
-            trace2 = go.Scatter(
-                x=df[x_col], y=df[y2_col], name=y2_col, mode='markers',
-                marker=dict(color=color2, size=10, opacity=opacity2, symbol='diamond', line=dict(width=1.5, color='white')),
-                hovertemplate=f"<b>{x_col}</b>: %{{x}}<br><b>{y2_col}</b>: %{{y:,.2f}}<br><extra></extra>"
-            )
-        elif chart2_type == 'area':
-            trace2 = go.Scatter(
-                x=df[x_col], y=df[y2_col], name=y2_col, mode='lines', fill='tozeroy',
-                line=dict(color=color2, width=2.5, dash='dot'), opacity=opacity2 * 0.7,
-                hovertemplate=f"<b>{x_col}</b>: %{{x}}<br><b>{y2_col}</b>: %{{y:,.2f}}<br><extra></extra>"
-            )
-        else:
-            trace2 = go.Scatter(x=df[x_col], y=df[y2_col], name=y2_col, mode='lines', line=dict(color=color2, dash='dash'))
-        fig.add_trace(trace2, secondary_y=True)
-
-    fig.update_xaxes(
-        title_text=x_col, title_font=dict(size=14, color='#2c3e50'),
-        showgrid=True, gridcolor='rgba(128, 128, 128, 0.2)', zeroline=False
-    )
-    fig.update_yaxes(
-        title_text=y1_col, title_font=dict(size=14, color='#2c3e50'),
-        secondary_y=False, showgrid=True, gridcolor='rgba(128, 128, 128, 0.2)', zeroline=False
-    )
-    fig.update_yaxes(
-        title_text=y2_col, title_font=dict(size=14, color='#2c3e50'),
-        secondary_y=True, showgrid=False, zeroline=False
-    )
+                for group_val, rows in positions.items()
+            ]
+    colors = _get_color_palette(color_scheme, len(groups) if color_col else 2)
+    n_colors = len(colors)
 
     title_text = f"Combo Chart: {y1_col} ({chart1_type}) + {y2_col} ({chart2_type})"
     if color_col:
         title_text += f" by {color_col}"
-    fig.update_layout(
+    # The whole layout, theme template included, is built up front and handed
+    # to the Figure constructor: one validation pass instead of an
+    # update_layout per concern. The secondary axis is a plain overlaying
+    # yaxis2 with the same anchors and domains make_subplots would produce
+    # (the x domain leaves room for the right-hand tick labels).
+    axis_title_font = dict(size=14, color='#2c3e50')
+    layout = dict(
+        xaxis=dict(
+            anchor='y', domain=[0.0, 0.94],
+            title=dict(text=x_col, font=axis_title_font),
+            showgrid=True, gridcolor='rgba(128, 128, 128, 0.2)', zeroline=False
+        ),
+        yaxis=dict(
+            anchor='x', domain=[0.0, 1.0],
+            title=dict(text=y1_col, font=axis_title_font),
+            showgrid=True, gridcolor='rgba(128, 128, 128, 0.2)', zeroline=False
+        ),
+        yaxis2=dict(
+            anchor='x', overlaying='y', side='right',
+            title=dict(text=y2_col, font=axis_title_font),
+            showgrid=False, zeroline=False
+        ),
         title=dict(text=title_text, font=dict(size=18, color='#1f77b4'), x=0.5, xanchor='center'),
         hovermode='x unified',
         hoverlabel=dict(bgcolor='rgba(255, 255, 255, 0.95)', bordercolor='#1f77b4', font_size=12, font_family="Arial"),
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, font=dict(size=11),
                    bgcolor='rgba(255, 255, 255, 0.8)', bordercolor='rgba(0, 0, 0, 0.2)', borderwidth=1),
         margin=dict(l=60, r=60, t=80, b=60),
-        plot_bgcolor='rgba(255, 255, 255, 0.8)', paper_bgcolor='rgba(255, 255, 255, 0.95)'
+        plot_bgcolor='rgba(255, 255, 255, 0.8)', paper_bgcolor='rgba(255, 255, 255, 0.95)',
+        template=_theme_template(),
     )
-    fig = apply_theme(fig)
-    return fig
+
+    build1 = _TRACE_BUILDERS.get(chart1_type, _primary_fallback_trace)
+    build2 = _TRACE_BUILDERS.get(chart2_type, _secondary_fallback_trace)
+    # Only connected series are thinned; bars and scatter points stay exact
+    thin1 = chart1_type in ('line', 'area')
+    thin2 = chart2_type in ('line', 'area')
+
+    # Hover templates are built once per chart; per-group traces carry their
+    # group label in the trace-level meta, read back with %{meta}
+    y1_hover_base = f"<b>{x_col}</b>: %{{x}}<br><b>{y1_col}</b>: %{{y:,.2f}}<br>"
+    y2_hover_base = f"<b>{x_col}</b>: %{{x}}<br><b>{y2_col}</b>: %{{y:,.2f}}<br>"
+    hover_end = "<br><extra></extra>"
+
+    # Each axis gets a list of (x, y, name, color, hovertemplate, extra) series:
+    # one per color group, or a single series when ungrouped; extra holds any
+    # additional trace properties. Both axes then go through the same build loop.
+    if color_col:
+        y1_hover_group = y1_hover_base + f"<b>{color_col}</b>: "
+        y2_hover_group = y2_hover_base + f"<b>{color_col}</b>: "
+        y1_hover_meta = y1_hover_group + "%{meta}" + hover_end
+        y2_hover_meta = y2_hover_group + "%{meta}" + hover_end
+        # The palette is already cycled to one color per group; the right-axis
+        # colorway is the same palette rotated half-way round
+        offset = n_colors // 2
+        colors2 = colors[offset:] + colors[:offset]
+        collapse = len(groups) >= _COLLAPSE_SCATTER_MIN_GROUPS
+        collapse1 = collapse and chart1_type == 'scatter'
+        collapse2 = collapse and chart2_type == 'scatter'
+        if collapse1:
+            series1 = _collapsed_scatter_series(groups, colors, 2, y1_col, color_col, y1_hover_group)
+        else:
+            series1 = [
+                (group_x, group_y1, f"{y1_col} ({label})", color, y1_hover_meta, {'meta': label})
+                for (label, group_x, group_y1, _), color in zip(groups, colors)
+            ]
+        if collapse2:
+            series2 = _collapsed_scatter_series(groups, colors2, 3, y2_col, color_col, y2_hover_group)
+        else:
+            series2 = [
+                (group_x, group_y2, f"{y2_col} ({label})", color, y2_hover_meta, {'meta': label})
+                for (label, group_x, _, group_y2), color in zip(groups, colors2)
+            ]
+        if collapse1 or collapse2:
+            collapsed_cols = [col for col, flag in ((y1_col, collapse1), (y2_col, collapse2)) if flag]
+            layout['annotations'] = [_collapsed_groups_note(collapsed_cols, color_col, len(groups))]
+            layout['margin'] = dict(layout['margin'], b=90)
+    else:
+        series1 = [(
+            x_arr, _to_plot_dtype(y1_arr), y1_col,
+            colors[0] if n_colors > 0 else '#1f77b4', y1_hover_base + "<extra></extra>", None,
+        )]
+        series2 = [(
+            x_arr, _to_plot_dtype(y2_arr), y2_col,
+            colors[1] if n_colors > 1 else '#ff7f0e', y2_hover_base + "<extra></extra>", None,
+        )]
+
+    grouped = bool(color_col)
+    sizes = _TRACE_SIZES[grouped]
+    # Collected for a single go.Figure call: left-axis traces first, then
+    # right-axis traces
+    traces = []
+    for build, thin, opacity, secondary, axis_refs, series in (
+        (build1, thin1, opacity1, False, _PRIMARY_AXIS_REFS, series1),
+        (build2, thin2, opacity2, True, _SECONDARY_AXIS_REFS, series2),
+    ):
+        for x, y, name, color, hovertemplate, extra in series:
+            if thin:
+                x, y = _lttb(x, y)
+            trace = build(x, y, name, color, opacity, hovertemplate, sizes, secondary, grouped)
+            if extra:
+                trace.update(extra)
+            trace.update(axis_refs)
+            traces.append(trace)
+
+    # Built in one call from plain dicts, like utils.create_error_figure
+    return go.Figure(data=traces, layout=layout, skip_invalid=True)
@@ -2,12 +2,104 @@
 Heatmap chart: correlation matrix, pivot table, and fallbacks.
 """
 
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from typing import Optional, List
 
-from ..utils import create_error_figure
+from ..utils import create_error_figure, plotly_express, NUMERIC_KINDS
+
+try:
+    from fastpivot import pivot_table as _fast_pivot_table
+except ImportError:
+    _fast_pivot_table = None
+
+# Rows fed to correlation/pivot; larger frames are randomly down-sampled
+_HEATMAP_SAMPLE_ROWS = 5000
+# Pivots wider or taller than this are coarsened to this many bins per axis
+_HEATMAP_MAX_BINS = 200
+
+
+def _sample_rows(df: pd.DataFrame, n: int = _HEATMAP_SAMPLE_ROWS) -> pd.DataFrame:
+    """Reproducible random sample of at most n rows (covers the whole frame, not just its head)."""
+    if len(df) <= n:
+        return df
+    return df.sample(n=n, random_state=0)
+
+
+def _mean_pivot(df: pd.DataFrame, index: str, columns: str, values: str) -> pd.DataFrame:
+    """
+    Mean of values by index x columns, matching pivot_table(aggfunc='mean').
+    Uses fastpivot when installed, otherwise a groupby/unstack.
+    """
+    if _fast_pivot_table is not None:
+        try:
+            return _fast_pivot_table(df, index=index, columns=columns, values=values, aggfunc='mean')
+        except Exception:
+            # fastpivot rejects some inputs (e.g. read-only Copy-on-Write buffers)
+            pass
+    pivot = df.groupby([index, columns], observed=True)[values].mean().unstack(columns)
+    return pivot.dropna(how='all').dropna(axis=1, how='all')
+
+
+def _coarsen_axis(values: np.ndarray, labels, axis: int):
+    """
+    Merge runs of adjacent rows (axis=0) or columns (axis=1) into at most
+    _HEATMAP_MAX_BINS bins, each the NaN-ignoring mean of its cells, in one
+    np.add.reduceat pass. Merged bins are labelled "first – last".
+    """
+    n = values.shape[axis]
+    # n > bins, so the floored starts are strictly increasing (no empty bins)
+    starts = np.linspace(0, n, _HEATMAP_MAX_BINS + 1)[:-1].astype(np.intp)
+    valid = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(valid, values, 0.0), starts, axis=axis)
+    counts = np.add.reduceat(valid.astype(np.int64), starts, axis=axis)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = sums / counts
+    ends = np.append(starts[1:], n) - 1
+    bin_labels = [
+        str(labels[a]) if a == b else f"{labels[a]} – {labels[b]}"
+        for a, b in zip(starts, ends)
+    ]
+    return means, bin_labels
+
+
+def _coarsen_pivot(pivot: pd.DataFrame) -> pd.DataFrame:
+    """
+    Bound a pivot to _HEATMAP_MAX_BINS x _HEATMAP_MAX_BINS cells so plotly.js
+    renders and hovers a fixed-size grid. Smaller pivots are returned as is.
+    """
+    n_rows, n_cols = pivot.shape
+    if n_rows <= _HEATMAP_MAX_BINS and n_cols <= _HEATMAP_MAX_BINS:
+        return pivot
+    values = pivot.to_numpy(dtype=np.float64, na_value=np.nan)
+    row_labels, col_labels = pivot.index.tolist(), pivot.columns.tolist()
+    if n_rows > _HEATMAP_MAX_BINS:
+        values, row_labels = _coarsen_axis(values, row_labels, axis=0)
+    if n_cols > _HEATMAP_MAX_BINS:
+        values, col_labels = _coarsen_axis(values, col_labels, axis=1)
+    return pd.DataFrame(
+        values,
+        index=pd.Index(row_labels, name=pivot.index.name),
+        columns=pd.Index(col_labels, name=pivot.columns.name),
+    )
+
+
+def _correlation_matrix(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pearson correlation between df's columns, as df.corr(). A NaN-free real
+    frame goes through a single np.corrcoef over one contiguous float64 matrix;
+    otherwise pandas' pairwise-complete corr() handles the missing values.
+    """
+    if any(dtype.kind == 'c' for dtype in df.dtypes):
+        return df.corr()
+    arr = df.to_numpy(dtype=np.float64, na_value=np.nan)
+    if len(arr) < 2 or np.isnan(arr).any():
+        return df.corr()
+    # Constant columns divide by a zero std and come out NaN, as in pandas
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = np.corrcoef(arr, rowvar=False)
+    return pd.DataFrame(corr, index=df.columns, columns=df.columns)
 
 
 def generate_heatmap(
@@ -20,8 +112,11 @@ def generate_heatmap(
     Generate heatmap figure. Handles correlation matrix, pivot table, or X/Y fallback.
     Caller is responsible for apply_theme.
     """
+    px = plotly_express()
+
+    cols = frozenset(df_agg.columns)
     if heatmap_columns and len(heatmap_columns) > 0:
-        heatmap_cols = [col for col in heatmap_columns if col != 'None' and col in df_agg.columns]
+        heatmap_cols = [col for col in heatmap_columns if col != 'None' and col in cols]
 
         if len(heatmap_cols) == 0:
             return create_error_figure("Please select at least one column for heatmap")
@@ -31,31 +126,19 @@ def generate_heatmap(
             )
 
         try:
-            df_sample = df_agg[heatmap_cols].head(1000)
+            # Classify on the full frame's dtypes, then sample only the columns
+            # the chosen view reads (sampling picks the same rows either way)
             numeric_cols = [
                 col for col in heatmap_cols
-                if pd.api.types.is_numeric_dtype(df_sample[col])
+                if df_agg[col].dtype.kind in NUMERIC_KINDS
             ]
 
-            if len(numeric_cols) == len(heatmap_cols):
-                corr_matrix = df_sample[numeric_cols].corr()
+            if len(numeric_cols) >= 2:
+                corr_matrix = _correlation_matrix(_sample_rows(df_agg[numeric_cols]))
+                described = "columns" if len(numeric_cols) == len(heatmap_cols) else "numeric columns"
                 fig = px.imshow(
                     corr_matrix,
-                    title=f"Heatmap: Correlation Matrix ({len(numeric_cols)} columns)",
-                    labels=dict(color="Correlation"),
-                    color_continuous_scale='RdBu',
-                    aspect="auto"
-                )
-                fig.update_layout(
-                    xaxis_title="",
-                    yaxis_title="",
-                    height=max(400, len(numeric_cols) * 50)
-                )
-            elif len(numeric_cols) >= 2:
-                corr_matrix = df_sample[numeric_cols].corr()
-                fig = px.imshow(
-                    corr_matrix,
-                    title=f"Heatmap: Correlation Matrix ({len(numeric_cols)} numeric columns)",
+                    title=f"Heatmap: Correlation Matrix ({len(numeric_cols)} {described})",
                     labels=dict(color="Correlation"),
                     color_continuous_scale='RdBu',
                     aspect="auto"
@@ -68,22 +151,25 @@ def generate_heatmap(
             else:
                 categorical_cols = [
                     col for col in heatmap_cols
-                    if not pd.api.types.is_numeric_dtype(df_sample[col])
+                    if df_agg[col].dtype.kind not in NUMERIC_KINDS
                 ]
+                df_sample = _sample_rows(
+                    df_agg[list(dict.fromkeys(categorical_cols[:2] + numeric_cols[:1]))]
+                )
 
                 if len(categorical_cols) >= 2 and len(numeric_cols) >= 1:
-                    pivot = df_sample.pivot_table(
-                        values=numeric_cols[0],
+                    pivot = _mean_pivot(
+                        df_sample,
                         index=categorical_cols[0],
-                        columns=categorical_cols[1] if len(categorical_cols) > 1 else None,
-                        aggfunc='mean'
+                        columns=categorical_cols[1],
+                        values=numeric_cols[0],
                     )
                     if pivot.empty:
                         return create_error_figure(
                             "Cannot create heatmap pivot table with selected columns"
                         )
                     fig = px.imshow(
-                        pivot,
+                        _coarsen_pivot(pivot),
                         title=f"Heatmap: {numeric_cols[0]} by {categorical_cols[0]}",
                         labels=dict(color=numeric_cols[0]),
                         aspect="auto"
@@ -94,7 +180,7 @@ def generate_heatmap(
                     ).reset_index()
                     pivot = pivot.set_index(categorical_cols[0])[[numeric_cols[0]]].T
                     fig = px.imshow(
-                        pivot,
+                        _coarsen_pivot(pivot),
                         title=f"Heatmap: {numeric_cols[0]} by {categorical_cols[0]}",
                         labels=dict(color=numeric_cols[0]),
                         aspect="auto"
@@ -108,19 +194,22 @@ def generate_heatmap(
         except Exception as e:
             return create_error_figure(f"Heatmap error: {str(e)}")
 
-    if x_col and x_col in df_agg.columns and y_col and y_col in df_agg.columns:
+    if x_col and x_col in cols and y_col and y_col in cols:
         try:
-            df_sample = df_agg.head(1000)
-            pivot = df_sample.pivot_table(
-                values=y_col if pd.api.types.is_numeric_dtype(df_sample[y_col]) else None,
-                index=x_col,
-                aggfunc=(
-                    'mean' if pd.api.types.is_numeric_dtype(df_sample[y_col]) else 'count'
-                )
+            y_is_numeric = df_agg[y_col].dtype.kind in NUMERIC_KINDS
+            # A numeric mean only needs x/y, so sample just those columns; the
+            # count view covers every column and keeps the full frame
+            df_sample = _sample_rows(
+                df_agg[list(dict.fromkeys([x_col, y_col]))] if y_is_numeric else df_agg
             )
+            grouped = df_sample.groupby(x_col, observed=True)
+            if y_is_numeric:
+                pivot = grouped[y_col].mean().to_frame().dropna(how='all')
+            else:
+                pivot = grouped.count().sort_index(axis=1)
             if pivot.empty:
                 return create_error_figure("Cannot create heatmap with selected columns")
-            return px.imshow(pivot, title=f"Heatmap: {y_col} by {x_col}")
+            return px.imshow(_coarsen_pivot(pivot), title=f"Heatmap: {y_col} by {x_col}")
         except Exception:
             return create_error_figure(
                 "Heatmap needs numeric data—try different columns!"
@@ -2,13 +2,57 @@
 Thin dispatcher for chart generation. No Streamlit UI; delegates to charts.* and applies theme.
 """
 
+import hashlib
+from collections import Counter, OrderedDict
+
+import numpy as np
 import pandas as pd
+import streamlit as st
 import plotly.graph_objects as go
 from typing import Optional
 
-from ..utils import create_error_figure, apply_theme
+from ..utils import create_error_figure, apply_theme, _lttb, _LTTB_MAX_POINTS
 from ..charts.basic import generate_basic_chart
 from ..charts.heatmap import generate_heatmap
+from ..charts.combo import ComboData, generate_combo_chart, _combo_frame
+from .data_fetcher import get_cache_version
+
+
+# Memoized figures for cached_generate_chart / cached_generate_combo_chart. Shares the viz_fig_cache prefix so
+# on_data_changed() clears it together with the Visualization Centre figure cache.
+_CHART_CACHE_KEY = "viz_fig_cache_charts"
+_CHART_CACHE_MAX_ENTRIES = 32
+
+# Line/area charts above this many points are thinned with LTTB, the same
+# static down-sampling combo charts use. st.plotly_chart serves a plain figure
+# with no server callbacks, so the thinning is fixed: zooming in shows the
+# thinned series, not extra detail. Scatter points are left exact.
+_THIN_CHART_TYPES = ('line', 'area')
+
+
+def _thin_line_traces(fig: go.Figure) -> go.Figure:
+    """
+    LTTB-thin every line trace longer than _LTTB_MAX_POINTS in place. Traces
+    sharing a stackgroup are skipped, since thinning them independently would
+    misalign the stack; _lttb itself skips non-numeric, unsorted or NaN data.
+    """
+    # scattergl traces have no stackgroup property
+    stacks = [getattr(trace, 'stackgroup', None) for trace in fig.data]
+    stack_sizes = Counter(stack for stack in stacks if stack)
+    for trace, stack in zip(fig.data, stacks):
+        if trace.type not in ('scatter', 'scattergl') or 'lines' not in (trace.mode or ''):
+            continue
+        if stack and stack_sizes[stack] > 1:
+            continue
+        if trace.x is None or trace.y is None or len(trace.y) <= _LTTB_MAX_POINTS:
+            continue
+        x, y = _lttb(np.asarray(trace.x), np.asarray(trace.y))
+        if len(y) < len(trace.y):
+            trace.update(x=x, y=y)
+    return fig
+
+# Aggregations offered in the UI; called as SeriesGroupBy methods to skip .agg()'s string dispatch
+_GROUPBY_AGG_METHODS = frozenset({'sum', 'mean', 'count', 'min', 'max'})
 
 
 def generate_chart(
@@ -26,13 +70,25 @@ def generate_chart(
     Generate Plotly figure based on user selections.
     Supports: bar, line, scatter, area, box, histogram, pie, heatmap.
     """
-    if df.empty:
+    if not len(df.index):
         return create_error_figure("No data available—check your manipulations!")
 
-    if agg_func != 'none' and y_col and y_col in df.columns:
+    # Column membership is checked repeatedly below; hash the names once
+    cols = frozenset(df.columns)
+
+    if agg_func != 'none' and y_col and y_col in cols:
         if chart_type in ['bar', 'line', 'area']:
-            if x_col and x_col in df.columns:
-                df_agg = df.groupby(x_col)[y_col].agg(agg_func).reset_index()
+            if x_col and x_col in cols:
+                # Group string keys as categoricals: codes are hashed once and
+                # observed=True skips unused categories
+                x_key = df[x_col]
+                if x_key.dtype == object:
+                    x_key = x_key.astype("category")
+                gb = df[y_col].groupby(x_key, observed=True)
+                if agg_func in _GROUPBY_AGG_METHODS:
+                    df_agg = getattr(gb, agg_func)().reset_index()
+                else:
+                    df_agg = gb.agg(agg_func).reset_index()
             else:
                 df_agg = df
         else:
@@ -40,11 +96,13 @@ def generate_chart(
     else:
         df_agg = df
 
-    if color_col and color_col != 'None' and color_col not in df_agg.columns:
+    # Aggregation keeps only the x/y columns, so re-derive the set when it ran
+    agg_cols = cols if df_agg is df else frozenset(df_agg.columns)
+    if color_col and color_col != 'None' and color_col not in agg_cols:
         color_col = None
-    if x_col and x_col not in df_agg.columns:
+    if x_col and x_col not in agg_cols:
         x_col = None
-    if y_col and y_col not in df_agg.columns:
+    if y_col and y_col not in agg_cols:
         y_col = None
 
     try:
@@ -60,7 +118,143 @@ def generate_chart(
                 title_override,
                 color_palette,
             )
+        if chart_type in _THIN_CHART_TYPES and len(df_agg) > _LTTB_MAX_POINTS:
+            fig = _thin_line_traces(fig)
         fig = apply_theme(fig)
         return fig
     except Exception as e:
         return create_error_figure(f"Error generating chart: {str(e)}")
+
+
+def _df_fingerprint(df: pd.DataFrame) -> tuple:
+    """
+    DataFrame identity: shape, columns and a digest of every row's hash, in
+    order. Hashing the whole frame is cheap at the preview sizes charted here
+    and, unlike a head sample, tells apart frames that differ in later rows.
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    digest = hashlib.md5(row_hashes.tobytes()).hexdigest()
+    return (df.shape, tuple(map(str, df.columns)), digest)
+
+
+def _memoized(key_parts: tuple, build) -> go.Figure:
+    """
+    Return the figure stored under (cache version, *key_parts) in st.session_state,
+    building and storing it on a miss. Bounded to the 32 most recent figures.
+    Unhashable key parts (e.g. list cells in the fingerprint) skip memoization.
+    """
+    key = (get_cache_version(),) + key_parts
+    try:
+        hash(key)
+    except TypeError:
+        return build()
+
+    cache = st.session_state.setdefault(_CHART_CACHE_KEY, OrderedDict())
+    fig = cache.get(key)
+    if fig is not None:
+        cache.move_to_end(key)
+        return fig
+
+    fig = build()
+    cache[key] = fig
+    if len(cache) > _CHART_CACHE_MAX_ENTRIES:
+        cache.popitem(last=False)
+    return fig
+
+
+def cached_generate_chart(
+    df: pd.DataFrame,
+    chart_type: str,
+    x_col: Optional[str],
+    y_col: Optional[str],
+    agg_func: str = 'none',
+    color_col: Optional[str] = None,
+    heatmap_columns: Optional[list] = None,
+    title_override: Optional[str] = None,
+    color_palette: Optional[list] = None
+) -> go.Figure:
+    """
+    generate_chart memoized in st.session_state for the current cache version.
+    Identical parameters on the same data return the stored figure without
+    re-running aggregation or Plotly.
+    """
+    try:
+        fingerprint = _df_fingerprint(df)
+    except TypeError:
+        # Unhashable cell values: skip memoization
+        fingerprint = None
+
+    def build() -> go.Figure:
+        return generate_chart(
+            df, chart_type, x_col, y_col, agg_func, color_col,
+            heatmap_columns, title_override, color_palette,
+        )
+
+    if fingerprint is None:
+        return build()
+    return _memoized(
+        (
+            'basic',
+            fingerprint,
+            chart_type,
+            x_col,
+            y_col,
+            agg_func,
+            color_col,
+            tuple(heatmap_columns) if heatmap_columns else None,
+            title_override,
+            tuple(color_palette) if color_palette else None,
+        ),
+        build,
+    )
+
+
+def cached_generate_combo_chart(
+    df: ComboData,
+    x_col: str,
+    y1_col: str,
+    y2_col: str,
+    chart1_type: str = 'bar',
+    chart2_type: str = 'line',
+    color_col: Optional[str] = None,
+    color_scheme: str = 'plotly',
+    opacity1: float = 0.8,
+    opacity2: float = 0.8
+) -> go.Figure:
+    """
+    generate_combo_chart memoized like cached_generate_chart (shared LRU).
+    Arrow-capable input is converted to pandas first, so it is fingerprinted
+    and plotted from the same frame.
+    """
+    converted = _combo_frame(df, x_col, y1_col, y2_col, color_col)
+    if converted is not None:
+        df = converted
+    try:
+        fingerprint = _df_fingerprint(df) if isinstance(df, pd.DataFrame) else None
+    except TypeError:
+        fingerprint = None
+
+    def build() -> go.Figure:
+        return generate_combo_chart(
+            df, x_col, y1_col, y2_col, chart1_type, chart2_type,
+            color_col, color_scheme, opacity1, opacity2,
+        )
+
+    if fingerprint is None:
+        return build()
+    return _memoized(
+        (
+            'combo',
+            fingerprint,
+            x_col,
+            y1_col,
+            y2_col,
+            chart1_type,
+            chart2_type,
+            color_col,
+            color_scheme,
+            opacity1,
+            opacity2,
+        ),
+        build,
+    )
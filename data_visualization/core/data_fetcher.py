@@ -7,10 +7,26 @@ Optimized for <1s latency using multi-layer caching strategy:
 """
 
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import streamlit as st
-from typing import Optional, Dict, Any
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from typing import Optional, Dict, Any, Iterable, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
 
 FASTAPI_URL = os.getenv("FASTAPI_URL", "https://data-assistant-84sf.onrender.com")
 SESSION_ENDPOINT = f"{FASTAPI_URL}/api/session"
@@ -19,44 +35,179 @@ SESSION_ENDPOINT = f"{FASTAPI_URL}/api/session"
 _TABLES_CACHE_KEY = "viz_tables_cache"
 _DF_CACHE_KEY = "viz_df_cache"
 _CACHE_VERSION_KEY = "viz_cache_version"
+_PREFETCH_KEY = "viz_prefetched"
+
+# Preview fetches are I/O-bound, so threads overlap them despite the GIL
+_PREFETCH_WORKERS = 4
+
+# Layer-2 TTL. on_data_changed() bumps the version on every manipulation,
+# so the TTL only bounds staleness from changes made outside the app.
+_API_CACHE_TTL = 60
+
+# Shared keep-alive session so reruns reuse pooled connections to the backend
+_SESSION = requests.Session()
+# Short backoff retries absorb connection resets from the backend's idle keep-alive timeout
+_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.2, allowed_methods=frozenset({"GET"})),
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.headers.update({"Accept-Encoding": "gzip"})
+
+# Last ETag and tables per session, so TTL expiry revalidates with If-None-Match
+# and a 304 reuses the parsed tables instead of downloading and decoding again
+_TABLES_ETAGS: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+_TABLES_ETAGS_MAX_ENTRIES = 32
+# prefetch_tables reaches _fetch_tables_from_api from worker threads
+_TABLES_ETAGS_LOCK = threading.Lock()
 
 
 # ── Layer 2: TTL cache for the raw tables API response ────────────────────────
-@st.cache_data(ttl=30, show_spinner=False)
+@st.cache_data(ttl=_API_CACHE_TTL, show_spinner=False)
 def _fetch_tables_from_api(session_id: str, cache_version: int) -> Optional[Dict[str, Any]]:
     """
     Cached HTTP call to FastAPI. cache_version allows manual invalidation
     (increment it to bust the cache without waiting for TTL).
-    Returns the raw tables dict or None on error.
+    Returns the raw tables dict, or None when the request or its JSON fails.
+    Any other error propagates, so st.cache_data does not keep it for the TTL.
     """
+    with _TABLES_ETAGS_LOCK:
+        cached = _TABLES_ETAGS.get(session_id)
     try:
-        response = requests.get(
+        response = _SESSION.get(
             f"{SESSION_ENDPOINT}/{session_id}/tables",
             params={"format": "summary"},
+            headers={"If-None-Match": cached[0]} if cached else None,
             timeout=10,
+            stream=False,
         )
+        if response.status_code == 304 and cached:
+            return cached[1]
         response.raise_for_status()
-        return response.json().get("tables", {})
+        # orjson parses the raw bytes directly, skipping the str decode
+        payload = orjson.loads(response.content) if orjson is not None else response.json()
+    except (requests.RequestException, ValueError):
+        # Transport, HTTP status and JSON decode failures (orjson and requests
+        # both raise ValueError subclasses on bad JSON)
+        return None
+
+    tables = payload.get("tables", {})
+    etag = response.headers.get("ETag")
+    if etag:
+        with _TABLES_ETAGS_LOCK:
+            if session_id not in _TABLES_ETAGS and len(_TABLES_ETAGS) >= _TABLES_ETAGS_MAX_ENTRIES:
+                _TABLES_ETAGS.pop(next(iter(_TABLES_ETAGS)), None)
+            _TABLES_ETAGS[session_id] = (etag, tables)
+    return tables
+
+
+def _fetch_preview_arrow(session_id: str, table_name: str) -> Optional[pd.DataFrame]:
+    """
+    Fetch a table preview as an Arrow IPC stream. Columns arrive typed, so there is
+    no JSON decode or per-cell type inference. Returns None if pyarrow is missing
+    or the backend cannot serve Arrow, so the caller falls back to JSON.
+    """
+    if pa is None:
+        return None
+    try:
+        response = _SESSION.get(
+            f"{SESSION_ENDPOINT}/{session_id}/tables/{quote(table_name, safe='')}/preview",
+            timeout=10,
+        )
+        if response.status_code != 200:
+            return None
+        return pa.ipc.open_stream(response.content).read_pandas(self_destruct=True)
     except Exception:
         return None
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+def _number_text(number) -> str:
+    """Canonical text of a parsed number: '12' for integral values, else repr."""
+    number = float(number)
+    return str(int(number)) if number.is_integer() else repr(number)
+
+
+def _is_lossless_number(value, number) -> bool:
+    """
+    True when converting ``value`` to ``number`` loses nothing: numbers pass,
+    and strings must read back exactly, so IDs like '02134' or '+44' and
+    spellings like '1.50' stay text.
+    """
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return True
+    return isinstance(value, str) and value == _number_text(number)
+
+
+def _infer_preview_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Type the object columns of a JSON-decoded preview: a column becomes numeric
+    only when every non-null value converts without loss (see
+    _is_lossless_number), so numeric checks downstream skip the Python-object
+    path. Strings are left as they are: the preview has only about 10 rows,
+    too few for cardinality to say whether a column is categorical.
+    """
+    for col in df.columns:
+        series = df[col]
+        if series.dtype.kind != 'O' or not series.notna().any():
+            continue
+        numeric = pd.to_numeric(series, errors='coerce')
+        present = series.notna()
+        if numeric[present].isna().any():
+            continue
+        if all(_is_lossless_number(value, number) for value, number in zip(series[present], numeric[present])):
+            df[col] = numeric
+    return df
+
+
+@st.cache_data(ttl=_API_CACHE_TTL, show_spinner=False)
 def _build_dataframe(session_id: str, table_name: str, cache_version: int) -> Optional[pd.DataFrame]:
     """
     Cached DataFrame construction. Shares the cache_version with _fetch_tables_from_api
     so a single invalidation busts both caches at once.
     """
+    df = _fetch_preview_arrow(session_id, table_name)
+    if df is not None:
+        return df if not df.empty else None
+
     tables = _fetch_tables_from_api(session_id, cache_version)
     if tables is None or table_name not in tables:
         return None
     preview_data = tables[table_name].get("preview", [])
     if not preview_data:
         return None
-    return pd.DataFrame(preview_data)
+    return _infer_preview_dtypes(pd.DataFrame(preview_data))
 
 
 # ── Layer 1: session_state hot cache ──────────────────────────────────────────
+def _to_ipc_bytes(df: pd.DataFrame):
+    """
+    Serialize a DataFrame to Arrow IPC stream bytes for the hot cache. The bytes
+    are far smaller than object-dtype columns and pickle as one buffer. Returns
+    the DataFrame unchanged if pyarrow is missing or a column cannot be typed.
+    """
+    if pa is None:
+        return df
+    try:
+        table = pa.Table.from_pandas(df)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return df
+
+
+def _from_ipc_bytes(cached) -> pd.DataFrame:
+    """Decode a hot-cache entry written by _to_ipc_bytes."""
+    if isinstance(cached, bytes):
+        return pa.ipc.open_stream(cached).read_all().to_pandas()
+    return cached
+
+
 def get_cache_version() -> int:
     """Return current cache version (increments on data manipulation)."""
     return st.session_state.get(_CACHE_VERSION_KEY, 0)
@@ -73,6 +224,39 @@ def invalidate_viz_cache():
             del st.session_state[key]
 
 
+def _prefetch_one(session_id: str, table_name: str, version: int) -> None:
+    """Warm one table; a failure is left for the table's own render to retry and report."""
+    try:
+        _build_dataframe(session_id, table_name, version)
+    except Exception:
+        pass
+
+
+def prefetch_tables(session_id: str, table_names: Iterable[str]) -> None:
+    """
+    Warm the layer-2 cache for several tables at once. Previews are fetched
+    concurrently, so a page that shows several tables pays for the slowest
+    fetch rather than the sum. Runs once per session and cache version.
+    """
+    version = get_cache_version()
+    marker = (session_id, version)
+    if st.session_state.get(_PREFETCH_KEY) == marker:
+        return
+    st.session_state[_PREFETCH_KEY] = marker
+
+    table_names = list(table_names)
+    if len(table_names) < 2:
+        return
+
+    # Worker threads inherit the script context so st.cache_data runs without warnings
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=min(_PREFETCH_WORKERS, len(table_names)),
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx),
+    ) as executor:
+        list(executor.map(lambda name: _prefetch_one(session_id, name, version), table_names))
+
+
 def get_tables_from_session(session_id: str) -> Optional[Dict[str, Any]]:
     """
     Get tables dict with hot-cache. Returns instantly on cache hit.
@@ -84,7 +268,11 @@ def get_tables_from_session(session_id: str) -> Optional[Dict[str, Any]]:
     if hot_key in st.session_state:
         return st.session_state[hot_key]
 
-    tables = _fetch_tables_from_api(session_id, version)
+    try:
+        tables = _fetch_tables_from_api(session_id, version)
+    except Exception:
+        # Raised errors are not cached by st.cache_data, so the next rerun retries
+        return None
     if tables is not None:
         st.session_state[hot_key] = tables
     return tables
@@ -92,16 +280,20 @@ def get_tables_from_session(session_id: str) -> Optional[Dict[str, Any]]:
 
 def get_dataframe_from_session(session_id: str, table_name: str) -> Optional[pd.DataFrame]:
     """
-    Get DataFrame with hot-cache. Returns instantly on cache hit (~0ms).
-    Falls back to layer-2 TTL cache, then API on full miss.
+    Get DataFrame with hot-cache. A hit decodes the cached Arrow IPC bytes
+    (zero-copy for numeric columns). Falls back to layer-2 TTL cache, then API on full miss.
     """
     version = get_cache_version()
     hot_key = f"{_DF_CACHE_KEY}_{session_id}_{table_name}_{version}"
 
     if hot_key in st.session_state:
-        return st.session_state[hot_key]
+        return _from_ipc_bytes(st.session_state[hot_key])
 
-    df = _build_dataframe(session_id, table_name, version)
+    try:
+        df = _build_dataframe(session_id, table_name, version)
+    except Exception:
+        # Raised errors are not cached by st.cache_data, so the next rerun retries
+        return None
     if df is not None:
-        st.session_state[hot_key] = df
+        st.session_state[hot_key] = _to_ipc_bytes(df)
     return df
@@ -4,6 +4,69 @@ Column and chart validation: can_render and validation_message logic.
 
 from typing import Tuple, Optional, List, Dict, Any
 
+ValidationResult = Tuple[bool, Optional[str]]
+_OK: ValidationResult = (True, None)
+
+
+def _validate_xy(x_col: str, y_col: str, heatmap_columns) -> ValidationResult:
+    if x_col != 'None' and y_col != 'None':
+        return _OK
+    return (
+        False,
+        "⚠️ This chart type requires both X and Y columns. Please select both."
+    )
+
+
+def _validate_box(x_col: str, y_col: str, heatmap_columns) -> ValidationResult:
+    if y_col != 'None':
+        return _OK
+    return (False, "⚠️ Box plot requires Y column. Please select a Y-axis column.")
+
+
+def _validate_histogram(x_col: str, y_col: str, heatmap_columns) -> ValidationResult:
+    if x_col != 'None':
+        return _OK
+    return (False, "⚠️ Histogram requires X column. Please select an X-axis column.")
+
+
+def _validate_pie(x_col: str, y_col: str, heatmap_columns) -> ValidationResult:
+    if x_col != 'None' or y_col != 'None':
+        return _OK
+    return (
+        False,
+        "⚠️ Pie chart requires at least one column. Please select X or Y column."
+    )
+
+
+def _validate_heatmap(x_col: str, y_col: str, heatmap_columns) -> ValidationResult:
+    if heatmap_columns and len(heatmap_columns) >= 2:
+        return _OK
+    if x_col != 'None' and y_col != 'None':
+        return _OK
+    return (
+        False,
+        "⚠️ Heatmap requires at least 2 columns. Use the multi-select above or select X and Y columns."
+    )
+
+
+def _validate_any(x_col: str, y_col: str, heatmap_columns) -> ValidationResult:
+    # bar and any other
+    if x_col != 'None' or y_col != 'None':
+        return _OK
+    return (False, "⚠️ Please select at least one column (X or Y).")
+
+
+# Basic-mode validators by chart type, built once at import; unknown types fall back to _validate_any
+_BASIC_VALIDATORS = {
+    'line': _validate_xy,
+    'scatter': _validate_xy,
+    'area': _validate_xy,
+    'box': _validate_box,
+    'histogram': _validate_histogram,
+    'pie': _validate_pie,
+    'heatmap': _validate_heatmap,
+}
+
 
 def get_validation_result(
     chart_mode: str,
@@ -12,58 +75,17 @@ def get_validation_result(
     y_col: str,
     heatmap_columns: Optional[List[str]] = None,
     composition_params: Optional[Dict[str, Any]] = None,
-) -> Tuple[bool, Optional[str]]:
+) -> ValidationResult:
     """
     Determine if the current chart configuration can be rendered and optional message.
 
     Returns:
         (can_render, validation_message). validation_message is set when can_render is False.
     """
-    composition_params = composition_params or {}
-
     if chart_mode == 'combo':
-        if (
-            x_col != 'None'
-            and y_col != 'None'
-            and composition_params.get('y2_col')
-            and composition_params.get('y2_col') != 'None'
-        ):
-            return (True, None)
+        y2_col = (composition_params or {}).get('y2_col')
+        if x_col != 'None' and y_col != 'None' and y2_col and y2_col != 'None':
+            return _OK
         return (False, "⚠️ Combo chart requires X, Y1, and Y2 columns.")
 
-    # basic mode
-    if chart_type in ['line', 'scatter', 'area']:
-        if x_col != 'None' and y_col != 'None':
-            return (True, None)
-        return (
-            False,
-            "⚠️ This chart type requires both X and Y columns. Please select both."
-        )
-    if chart_type == 'box':
-        if y_col != 'None':
-            return (True, None)
-        return (False, "⚠️ Box plot requires Y column. Please select a Y-axis column.")
-    if chart_type == 'histogram':
-        if x_col != 'None':
-            return (True, None)
-        return (False, "⚠️ Histogram requires X column. Please select an X-axis column.")
-    if chart_type == 'pie':
-        if x_col != 'None' or y_col != 'None':
-            return (True, None)
-        return (
-            False,
-            "⚠️ Pie chart requires at least one column. Please select X or Y column."
-        )
-    if chart_type == 'heatmap':
-        if heatmap_columns and len(heatmap_columns) >= 2:
-            return (True, None)
-        if x_col != 'None' and y_col != 'None':
-            return (True, None)
-        return (
-            False,
-            "⚠️ Heatmap requires at least 2 columns. Use the multi-select above or select X and Y columns."
-        )
-    # bar and any other
-    if x_col != 'None' or y_col != 'None':
-        return (True, None)
-    return (False, "⚠️ Please select at least one column (X or Y).")
+    return _BASIC_VALIDATORS.get(chart_type, _validate_any)(x_col, y_col, heatmap_columns)
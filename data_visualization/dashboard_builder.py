@@ -99,13 +99,12 @@ class DashboardBuilder:
         Returns:
             Plotly figure
         """
-        from .core.chart_generator import generate_chart
-        from .charts.combo import generate_combo_chart
+        from .core.chart_generator import cached_generate_chart, cached_generate_combo_chart
 
         chart_mode = config.get('mode', 'basic')
 
         if chart_mode == 'basic':
-            return generate_chart(
+            return cached_generate_chart(
                 df,
                 config.get('chart_type', 'bar'),
                 config.get('x_col'),
@@ -117,7 +116,7 @@ class DashboardBuilder:
                 None
             )
         elif chart_mode == 'combo':
-            return generate_combo_chart(
+            return cached_generate_combo_chart(
                 df,
                 config.get('x_col'),
                 config.get('y_col'),
@@ -127,7 +126,7 @@ class DashboardBuilder:
                 config.get('color_col')
             )
         else:
-            return generate_chart(
+            return cached_generate_chart(
                 df,
                 config.get('chart_type', 'bar'),
                 config.get('x_col'),
@@ -2,18 +2,21 @@
 Chart control widgets: dropdowns, toggles, palette, quick templates, chart mode.
 """
 
+import numpy as np
 import pandas as pd
 import streamlit as st
-import plotly.express as px
+from plotly.colors import qualitative
 from typing import Dict, Any, List, Optional
 
+from ..utils import numeric_column_mask
 
-def _column_label(df: pd.DataFrame, col_name: str) -> str:
+
+def _column_label(col_name: str, numeric_by_col: Dict[str, bool]) -> str:
     if col_name == 'None':
         return "— None"
-    if col_name not in df.columns:
+    if col_name not in numeric_by_col:
         return col_name
-    if pd.api.types.is_numeric_dtype(df[col_name]):
+    if numeric_by_col[col_name]:
         return f"🔢 {col_name}"
     return f"🔤 {col_name}"
 
@@ -32,13 +35,17 @@ def _chart_label(chart_name: str) -> str:
     return mapping.get(chart_name, chart_name)
 
 
-def render_controls(df: pd.DataFrame) -> Dict[str, Any]:
+def render_controls(df: pd.DataFrame, numeric_mask: Optional[np.ndarray] = None) -> Dict[str, Any]:
     """
     Render Quick Templates, Chart Mode, Chart Controls expander, and Composition settings.
+    numeric_mask is the precomputed numeric_column_mask(df), if the caller has one.
     Returns a dict with chart_type, x_col, y_col, color_col, agg_func, heatmap_columns,
     chart_title, color_palette, chart_mode, composition_params.
     """
     cols = ['None'] + df.columns.tolist()
+    if numeric_mask is None:
+        numeric_mask = numeric_column_mask(df)
+    numeric_by_col = dict(zip(cols[1:], numeric_mask.tolist()))
 
     # Quick templates
     st.markdown(
@@ -100,38 +107,30 @@ def render_controls(df: pd.DataFrame) -> Dict[str, Any]:
             if 'viz_x_col' not in st.session_state:
                 default_x_idx = 0
                 if len(df.columns) > 0:
-                    for i, col in enumerate(df.columns):
-                        if not pd.api.types.is_numeric_dtype(df[col]):
-                            default_x_idx = i + 1
-                            break
-                    if default_x_idx == 0 and len(df.columns) > 0:
-                        default_x_idx = 1
+                    # First non-numeric column, else the first column
+                    default_x_idx = int(np.argmax(~numeric_mask)) + 1 if not numeric_mask.all() else 1
                 st.session_state['viz_x_col'] = cols[default_x_idx]
             if st.session_state.get('viz_x_col') not in cols:
                 st.session_state['viz_x_col'] = 'None'
             x_col = st.selectbox(
                 "X-Axis (or Category)",
                 options=cols,
-                format_func=lambda c: _column_label(df, c),
+                format_func=lambda c: _column_label(c, numeric_by_col),
                 key="viz_x_col"
             )
         with col3:
             if 'viz_y_col' not in st.session_state:
                 default_y_idx = 0
                 if len(df.columns) > 1:
-                    for i, col in enumerate(df.columns):
-                        if pd.api.types.is_numeric_dtype(df[col]):
-                            default_y_idx = i + 1
-                            break
-                    if default_y_idx == 0 and len(df.columns) > 1:
-                        default_y_idx = 2 if len(df.columns) > 1 else 1
+                    # First numeric column, else the second column
+                    default_y_idx = int(np.argmax(numeric_mask)) + 1 if numeric_mask.any() else 2
                 st.session_state['viz_y_col'] = cols[default_y_idx]
             if st.session_state.get('viz_y_col') not in cols:
                 st.session_state['viz_y_col'] = 'None'
             y_col = st.selectbox(
                 "Y-Axis (or Value)",
                 options=cols,
-                format_func=lambda c: _column_label(df, c),
+                format_func=lambda c: _column_label(c, numeric_by_col),
                 key="viz_y_col"
             )
         with col4:
@@ -142,7 +141,7 @@ def render_controls(df: pd.DataFrame) -> Dict[str, Any]:
             color_col = st.selectbox(
                 "Color/Group By (Optional)",
                 options=cols,
-                format_func=lambda c: _column_label(df, c),
+                format_func=lambda c: _column_label(c, numeric_by_col),
                 key="viz_color_col"
             )
 
@@ -153,8 +152,8 @@ def render_controls(df: pd.DataFrame) -> Dict[str, Any]:
             st.markdown("**Select multiple columns for correlation matrix or pivot table**")
             if 'viz_heatmap_cols' not in st.session_state:
                 st.session_state['viz_heatmap_cols'] = []
-            available_cols = [c for c in df.columns.tolist() if c in df.columns]
-            current_selection = [c for c in st.session_state.get('viz_heatmap_cols', []) if c in available_cols]
+            available_cols = df.columns.tolist()
+            current_selection = [c for c in st.session_state.get('viz_heatmap_cols', []) if c in numeric_by_col]
             selected_heatmap_cols = st.multiselect(
                 "Select Columns for Heatmap",
                 options=available_cols,
@@ -164,7 +163,7 @@ def render_controls(df: pd.DataFrame) -> Dict[str, Any]:
             )
             heatmap_columns = selected_heatmap_cols
             if len(selected_heatmap_cols) > 0:
-                numeric_count = sum(1 for c in selected_heatmap_cols if pd.api.types.is_numeric_dtype(df[c]))
+                numeric_count = sum(1 for c in selected_heatmap_cols if numeric_by_col.get(c, False))
                 categorical_count = len(selected_heatmap_cols) - numeric_count
                 if len(selected_heatmap_cols) < 2:
                     st.warning("⚠️ Please select at least 2 columns for heatmap")
@@ -179,7 +178,7 @@ def render_controls(df: pd.DataFrame) -> Dict[str, Any]:
 
         col_agg1, col_agg2 = st.columns([1, 3])
         with col_agg1:
-            if y_col != 'None' and y_col in df.columns and pd.api.types.is_numeric_dtype(df[y_col]):
+            if y_col != 'None' and numeric_by_col.get(y_col, False):
                 agg_func = st.selectbox(
                     "Aggregate Y By",
                     options=['none', 'sum', 'mean', 'count', 'min', 'max'],
@@ -202,10 +201,10 @@ def render_controls(df: pd.DataFrame) -> Dict[str, Any]:
         with style_col2:
             palette_options = {
                 "Default": None,
-                "Vibrant": px.colors.qualitative.Bold,
-                "Pastel": px.colors.qualitative.Pastel,
-                "Prism": px.colors.qualitative.Prism,
-                "Dark24": px.colors.qualitative.Dark24
+                "Vibrant": qualitative.Bold,
+                "Pastel": qualitative.Pastel,
+                "Prism": qualitative.Prism,
+                "Dark24": qualitative.Dark24
             }
             palette_choice = st.selectbox(
                 "Color Palette",
@@ -6,14 +6,16 @@ All kaleido calls are lazy: they only run when the user clicks "Generate", and
 the result is cached in session_state keyed to the chart config hash so that
 subsequent rerenders of the same chart are instant.
 
-fig.to_html() and the code exports are fast and always available immediately.
+The HTML download serializes on click (callable data); the code exports are
+fast and always available immediately.
 """
 
 import io
 import json
 import streamlit as st
 import plotly.graph_objects as go
-from typing import Optional
+import plotly.io as pio
+from typing import Dict, List, Optional
 
 _EXPORT_CACHE_KEY = "viz_export_cache"
 
@@ -62,7 +64,7 @@ def _lazy_image_button(
                      use_container_width=True):
             with st.spinner(f"Generating {fmt.upper()}…"):
                 try:
-                    data = fig.to_image(format=fmt, width=width, height=height)
+                    data = pio.to_image(fig, format=fmt, width=width, height=height, validate=False)
                     _cache_bytes(cfg_hash, fmt, data)
                     st.rerun()
                 except Exception as e:
@@ -71,6 +73,28 @@ def _lazy_image_button(
                         st.caption("💡 Install kaleido: `pip install kaleido`")
 
 
+def _generate_images(
+    fig: go.Figure,
+    formats: List[str],
+    cfg_hash: str,
+    width: int = 1200,
+    height: int = 800,
+) -> Dict[str, str]:
+    """
+    Render each missing image format in turn behind one button and cache the
+    successful ones. Returns {fmt: error} for failures.
+    """
+    errors = {}
+    for fmt in formats:
+        try:
+            image = pio.to_image(fig, format=fmt, width=width, height=height, validate=False)
+        except Exception as e:
+            errors[fmt] = str(e)
+            continue
+        _cache_bytes(cfg_hash, fmt, image)
+    return errors
+
+
 def render_export_section(
     fig: go.Figure,
     chart_mode: str,
@@ -101,6 +125,20 @@ def render_export_section(
         "and cached — subsequent downloads are instant."
     )
 
+    missing = [fmt for fmt in ("png", "svg", "pdf") if _get_cached(h, fmt) is None]
+    if len(missing) > 1 and st.button(
+        f"⚡ Generate {' + '.join(fmt.upper() for fmt in missing)}",
+        key=f"gen_all_{h[:8]}",
+    ):
+        with st.spinner("Generating images…"):
+            errors = _generate_images(fig, missing, h, height=export_height)
+        if errors:
+            for fmt, err in errors.items():
+                st.error(f"{fmt.upper()} export failed: {err}")
+            st.caption("💡 Install kaleido: `pip install kaleido`")
+        else:
+            st.rerun()
+
     col1, col2, col3 = st.columns(3)
 
     with col1:
@@ -128,19 +166,17 @@ def render_export_section(
         )
 
     with col3:
-        # HTML via fig.to_html() — no kaleido, always instant
-        try:
-            html_str = fig.to_html(full_html=False)
-            st.download_button(
-                "🌐 Download HTML",
-                html_str.encode(),
-                f"chart_{export_chart_name}_{selected_table}.html",
-                "text/html",
-                key=f"dl_html_{h[:8]}",
-                use_container_width=True,
-            )
-        except Exception as e:
-            st.error(f"HTML export failed: {e}")
+        # HTML via pio.to_html() — no kaleido; passed as a callable so it is only
+        # serialized when the user clicks. The figure was already validated on
+        # construction, so skip the second validation pass
+        st.download_button(
+            "🌐 Download HTML",
+            lambda: pio.to_html(fig, full_html=False, validate=False).encode(),
+            f"chart_{export_chart_name}_{selected_table}.html",
+            "text/html",
+            key=f"dl_html_{h[:8]}",
+            use_container_width=True,
+        )
 
     st.markdown("---")
     st.subheader("📦 Export More Formats")
@@ -3,8 +3,55 @@ Utility functions for the data_visualization module.
 Shared helper functions to avoid code duplication.
 """
 
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
+import plotly.io as pio
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Serialize figures (st.plotly_chart, to_html, to_image) with orjson when installed.
+# Set here because every chart module (basic, heatmap, combo) imports utils.
+try:
+    pio.json.config.default_engine = "orjson"
+except (ImportError, ValueError):
+    pass
+
+
+# numpy dtype kinds pandas treats as numeric (bool, int, uint, float, complex);
+# checking dtype.kind skips is_numeric_dtype's type-registry dispatch
+NUMERIC_KINDS = "biufc"
+
+
+def numeric_column_mask(df: pd.DataFrame) -> np.ndarray:
+    """
+    Boolean array aligned with df.columns, True where the column is numeric.
+    Computed once from df.dtypes so callers avoid per-column Series lookups.
+    """
+    return np.fromiter((dtype.kind in NUMERIC_KINDS for dtype in df.dtypes), dtype=bool, count=df.shape[1])
+
+
+@lru_cache(maxsize=1)
+def plotly_express():
+    """
+    Import plotly.express on first use: it is slow to import, and uncolored
+    xy charts, pies and pre-binned histograms never need it.
+    """
+    import plotly.express as px
+    return px
+
+
+@lru_cache(maxsize=32)
+def _error_figure_spec(message: str) -> dict:
+    """Figure spec for an error message; go.Figure copies it, so sharing is safe."""
+    return {"layout": {"annotations": [{"text": message, "showarrow": False}]}}
 
 
 def create_error_figure(message: str) -> go.Figure:
@@ -17,10 +64,27 @@ def create_error_figure(message: str) -> go.Figure:
     Returns:
         Plotly figure with error annotation
     """
-    return go.Figure().add_annotation(
-        text=message,
-        showarrow=False
-    )
+    # Build from a cached plain-dict spec in one pass instead of add_annotation's
+    # per-property validation. A fresh Figure is returned on every call since
+    # callers mutate it (apply_theme).
+    return go.Figure(_error_figure_spec(message), skip_invalid=True)
+
+
+# Plotly template matching the Streamlit theme; resolved once per process
+_THEME_TEMPLATE: Optional[str] = None
+
+
+def _theme_template() -> str:
+    """Return the cached Plotly template name for the configured Streamlit theme."""
+    global _THEME_TEMPLATE
+    if _THEME_TEMPLATE is None:
+        try:
+            theme = st.get_option("theme.base")
+            _THEME_TEMPLATE = 'plotly_dark' if theme == "dark" else 'plotly_white'
+        except Exception:
+            # Default to white theme
+            _THEME_TEMPLATE = 'plotly_white'
+    return _THEME_TEMPLATE
 
 
 def apply_theme(fig: go.Figure) -> go.Figure:
@@ -33,15 +97,56 @@ def apply_theme(fig: go.Figure) -> go.Figure:
     Returns:
         Figure with theme applied
     """
-    try:
-        theme = st.get_option("theme.base")
-        if theme == "dark":
-            fig.update_layout(template='plotly_dark')
-        else:
-            fig.update_layout(template='plotly_white')
-    except:
-        # Default to white theme
-        fig.update_layout(template='plotly_white')
-    
+    fig.update_layout(template=_theme_template())
     return fig
 
+
+# Line/area traces longer than this are thinned with LTTB before plotting;
+# the browser cannot draw more distinct points than the plot is wide anyway
+_LTTB_MAX_POINTS = 2000
+
+
+def _lttb_indices_impl(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: indices of ``n_out`` points (first and
+    last always kept) that preserve the visual shape of the series.
+    """
+    n = x.size
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        # Average of the next bucket is the third triangle vertex
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[avg_start:avg_end].mean()
+        avg_y = y[avg_start:avg_end].mean()
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+_lttb_indices = njit(cache=True)(_lttb_indices_impl) if njit is not None else _lttb_indices_impl
+
+
+def _lttb(x: np.ndarray, y: np.ndarray, n_out: int = _LTTB_MAX_POINTS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Down-sample a line series to ``n_out`` points with LTTB. Series that are
+    short, non-numeric, unsorted in x or contain NaNs are returned unchanged.
+    """
+    if len(y) <= n_out or x.dtype.kind not in 'iufM' or y.dtype.kind not in 'iuf':
+        return x, y
+    xf = (x.view(np.int64) if x.dtype.kind == 'M' else x).astype(np.float64)
+    yf = y.astype(np.float64)
+    if not (np.isfinite(xf).all() and np.isfinite(yf).all()) or (np.diff(xf) < 0).any():
+        return x, y
+    idx = _lttb_indices(xf, yf, n_out)
+    return x[idx], y[idx]
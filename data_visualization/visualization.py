@@ -18,9 +18,11 @@ from .core.data_fetcher import (
     get_tables_from_session,
     get_dataframe_from_session,
     get_cache_version,
+    prefetch_tables,
 )
 from .core.chart_generator import generate_chart
 from .core.validators import get_validation_result
+from .utils import numeric_column_mask
 from .charts.combo import generate_combo_chart
 from .ui.recommendations import render_recommendations_panel
 from .ui.controls import render_controls
@@ -108,6 +110,8 @@ def render_visualization_tab():
         return
 
     table_names = list(tables.keys())
+    # Load every table's preview in parallel so switching tables hits the cache
+    prefetch_tables(session_id, table_names)
     selected_table = (
         st.selectbox("Select Table to Visualize", table_names, key="viz_table_select")
         if len(table_names) > 1
@@ -121,6 +125,9 @@ def render_visualization_tab():
         st.warning("⚠️ No data available for visualization. The table may be empty.")
         return
 
+    # One dtype pass shared by the controls defaults and Quick Start suggestions
+    numeric_mask = numeric_column_mask(df)
+
     # ── Step 3: Data summary metrics (instant) ────────────────────────────────
     st.markdown('<div class="card-elevated" role="region" aria-label="Data summary">', unsafe_allow_html=True)
     c1, c2, c3 = st.columns(3)
@@ -138,7 +145,7 @@ def render_visualization_tab():
 
     with viz_left_col:
         render_recommendations_panel(df)
-        controls = render_controls(df)
+        controls = render_controls(df, numeric_mask)
 
     chart_type = controls["chart_type"]
     x_col = controls["x_col"]
@@ -225,8 +232,9 @@ def render_visualization_tab():
 
         elif not validation_message:
             st.info("👆 Select at least one column to get started.")
-            numeric_cols = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
-            categorical_cols = [c for c in df.columns if not pd.api.types.is_numeric_dtype(df[c])]
+            cols_arr = df.columns.to_numpy()
+            numeric_cols = cols_arr[numeric_mask].tolist()
+            categorical_cols = cols_arr[~numeric_mask].tolist()
             if numeric_cols or categorical_cols:
                 with st.expander("💡 Quick Start Suggestions", expanded=False):
                     if categorical_cols:
@@ -3,8 +3,8 @@ FastAPI application for file ingestion and session management.
 Stores DataFrames in Redis with automatic TTL expiration.
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Query
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Query, Header
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import logging
@@ -12,6 +12,7 @@ import os
 import uuid
 import time
 import base64
+import hashlib
 import pickle
 import json
 import pandas as pd
@@ -27,6 +28,11 @@ from ingestion.config import IngestionConfig
 from ingestion.supabase_handler import load_supabase_tables
 from redis_db.constants import KEY_SESSION_GRAPH
 
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
 KEY_SESSION_GRAPH = None
 
 # Logging
@@ -173,6 +179,7 @@ async def root():
             "supabase_import": "/api/ingestion/supabase-import",
             "health": "/health",
             "session_tables": "GET /api/session/{session_id}/tables",
+            "table_preview_arrow": "GET /api/session/{session_id}/tables/{table_name}/preview",
             "session_delete": "DELETE /api/session/{session_id}"
         }
     }
@@ -274,7 +281,11 @@ async def get_all_sessions():
     return JSONResponse(content={"success": True, "count": len(sessions), "sessions": sessions})
 
 @app.get("/api/session/{session_id}/tables")
-async def get_session_tables(session_id: str, format: str = Query("summary", pattern="^(summary|full)$")):
+async def get_session_tables(
+    session_id: str,
+    format: str = Query("summary", pattern="^(summary|full)$"),
+    if_none_match: Optional[str] = Header(None),
+):
     store = get_default_store()
     tables = store.load_session(session_id)
     if tables is None:
@@ -306,7 +317,37 @@ async def get_session_tables(session_id: str, format: str = Query("summary", pat
                 "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
                 "preview": df.head(10).to_dict(orient="records")
             }
-        return JSONResponse(content=response)
+        # Content hash as ETag: clients revalidate with If-None-Match and skip the body when unchanged
+        json_response = JSONResponse(content=response)
+        etag = f'"{hashlib.md5(json_response.body).hexdigest()}"'
+        if if_none_match == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        json_response.headers["ETag"] = etag
+        return json_response
+
+@app.get("/api/session/{session_id}/tables/{table_name}/preview")
+async def get_table_preview_arrow(session_id: str, table_name: str):
+    """Same rows as the summary preview, as an Arrow IPC stream with typed columns."""
+    if pa is None:
+        raise HTTPException(status_code=503, detail="Arrow previews not available")
+    store = get_default_store()
+    tables = store.load_session(session_id)
+    if tables is None:
+        raise HTTPException(status_code=404, detail=f"Session '{session_id}' not found")
+    if table_name not in tables:
+        raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
+
+    store.extend_ttl(session_id)
+
+    try:
+        table = pa.Table.from_pandas(tables[table_name].head(10), preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError) as e:
+        # Mixed-type object columns have no Arrow type; clients fall back to JSON
+        raise HTTPException(status_code=422, detail=f"Table not representable as Arrow: {e}")
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return Response(content=sink.getvalue().to_pybytes(), media_type="application/vnd.apache.arrow.stream")
 
 @app.get("/api/session/{session_id}/metadata")
 async def get_session_metadata(session_id: str):
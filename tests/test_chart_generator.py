@@ -0,0 +1,118 @@
+"""Tests for the figure memoization in data_visualization.core.chart_generator."""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+import streamlit as st
+
+from data_visualization.core import chart_generator
+from data_visualization.charts.combo import generate_combo_chart
+from data_visualization.core.chart_generator import _df_fingerprint, _memoized, cached_generate_combo_chart
+
+
+@pytest.fixture(autouse=True)
+def empty_figure_cache():
+    st.session_state.pop(chart_generator._CHART_CACHE_KEY, None)
+    yield
+    st.session_state.pop(chart_generator._CHART_CACHE_KEY, None)
+
+
+def _counting_builder():
+    calls = []
+
+    def build():
+        calls.append(1)
+        return go.Figure()
+
+    return build, calls
+
+
+def test_memoized_returns_stored_figure_on_hit():
+    build, calls = _counting_builder()
+
+    first = _memoized(("basic", 1), build)
+    second = _memoized(("basic", 1), build)
+
+    assert second is first
+    assert len(calls) == 1
+
+
+def test_memoized_builds_again_for_a_different_key():
+    build, calls = _counting_builder()
+
+    first = _memoized(("basic", 1), build)
+    second = _memoized(("basic", 2), build)
+
+    assert second is not first
+    assert len(calls) == 2
+
+
+def test_memoized_skips_unhashable_keys():
+    build, calls = _counting_builder()
+
+    _memoized(("basic", [1]), build)
+    _memoized(("basic", [1]), build)
+
+    assert len(calls) == 2
+    assert chart_generator._CHART_CACHE_KEY not in st.session_state
+
+
+def test_memoized_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(chart_generator, "_CHART_CACHE_MAX_ENTRIES", 2)
+    build, calls = _counting_builder()
+
+    _memoized(("basic", 1), build)
+    _memoized(("basic", 2), build)
+    _memoized(("basic", 1), build)  # refreshes key 1
+    _memoized(("basic", 3), build)  # evicts key 2
+    _memoized(("basic", 1), build)
+    _memoized(("basic", 2), build)
+
+    assert len(calls) == 4
+
+
+def test_fingerprint_distinguishes_frames_differing_past_the_head():
+    base = pd.DataFrame({"x": range(200), "y": range(200)})
+    changed = base.copy()
+    changed.loc[150, "y"] = -1
+
+    assert _df_fingerprint(base) == _df_fingerprint(base.copy())
+    assert _df_fingerprint(base) != _df_fingerprint(changed)
+
+
+def test_fingerprint_depends_on_row_order():
+    df = pd.DataFrame({"x": [1, 2, 3]}, index=[0, 0, 0])
+
+    assert _df_fingerprint(df) != _df_fingerprint(df.iloc[::-1])
+
+
+def test_thin_line_traces_thins_long_lines_but_not_shared_stacks():
+    n = chart_generator._LTTB_MAX_POINTS * 3
+    x = np.arange(n)
+    fig = go.Figure([
+        go.Scatter(x=x, y=np.sin(x / 50.0), mode="lines"),
+        go.Scatter(x=x, y=np.cos(x / 50.0), mode="lines", stackgroup="1"),
+        go.Scatter(x=x, y=np.cos(x / 50.0), mode="lines", stackgroup="1"),
+        go.Scatter(x=x, y=np.cos(x / 50.0), mode="markers"),
+    ])
+
+    chart_generator._thin_line_traces(fig)
+
+    assert [len(trace.y) for trace in fig.data] == [chart_generator._LTTB_MAX_POINTS, n, n, n]
+    assert fig.data[0].x[0] == 0 and fig.data[0].x[-1] == n - 1
+
+
+def test_arrow_table_through_both_combo_entry_points():
+    pa = pytest.importorskip("pyarrow")
+    frame = pd.DataFrame({"x": [1, 2, 3], "a": [1.0, 2.0, 3.0], "b": [3.0, 2.0, 1.0], "unused": ["p", "q", "r"]})
+    table = pa.table(frame)
+
+    direct = generate_combo_chart(table, "x", "a", "b")
+    cached = cached_generate_combo_chart(table, "x", "a", "b")
+    cached_again = cached_generate_combo_chart(table, "x", "a", "b")
+
+    expected = generate_combo_chart(frame, "x", "a", "b").to_plotly_json()
+    assert direct.to_plotly_json() == expected
+    assert cached.to_plotly_json() == expected
+    assert cached_again is cached
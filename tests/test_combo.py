@@ -0,0 +1,26 @@
+"""Tests for data_visualization.charts.combo."""
+
+import numpy as np
+import pandas as pd
+
+from data_visualization.charts.combo import _COLLAPSE_SCATTER_MIN_GROUPS, generate_combo_chart
+
+
+def test_collapsed_scatter_axis_has_no_dummy_group_legend_entries():
+    n_groups = _COLLAPSE_SCATTER_MIN_GROUPS + 5
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "x": np.arange(200),
+        "a": rng.random(200),
+        "b": rng.random(200),
+        "g": [f"g{i % n_groups}" for i in range(200)],
+    })
+
+    fig = generate_combo_chart(df, "x", "a", "b", "scatter", "line", color_col="g")
+
+    collapsed = [trace for trace in fig.data if trace.yaxis == "y"]
+    assert len(collapsed) == 1
+    assert len(collapsed[0].x) == len(df)
+    assert collapsed[0].showlegend is not False
+    assert len([trace for trace in fig.data if trace.yaxis == "y2"]) == n_groups
+    assert "colored by g" in fig.layout.annotations[0].text
@@ -0,0 +1,43 @@
+"""Tests for the JSON preview typing in data_visualization.core.data_fetcher."""
+
+import pandas as pd
+
+from data_visualization.core.data_fetcher import _infer_preview_dtypes
+
+
+def _preview(records):
+    return _infer_preview_dtypes(pd.DataFrame(records))
+
+
+def test_numeric_strings_become_numbers():
+    df = _preview({"ints": ["1", "2", "30"], "floats": ["1.5", "-0.25", "3"], "gaps": ["4", None, "6"]})
+
+    assert df["ints"].dtype.kind == "i"
+    assert df["ints"].tolist() == [1, 2, 30]
+    assert df["floats"].dtype.kind == "f"
+    assert df["floats"].tolist() == [1.5, -0.25, 3.0]
+    assert df["gaps"].dtype.kind == "f"
+    assert df["gaps"].isna().tolist() == [False, True, False]
+
+
+def test_identifier_strings_stay_text():
+    df = _preview({
+        "zip": ["02134", "10001", "94105"],
+        "phone": ["+4420", "+4421", "+4422"],
+        "padded": ["1.50", "2.00", "3.25"],
+        "words": ["a", "a", "b"],
+    })
+
+    assert df["zip"].tolist() == ["02134", "10001", "94105"]
+    assert df["phone"].tolist() == ["+4420", "+4421", "+4422"]
+    assert df["padded"].tolist() == ["1.50", "2.00", "3.25"]
+    for col in df.columns:
+        assert df[col].dtype.kind not in "iufc"
+        assert not isinstance(df[col].dtype, pd.CategoricalDtype)
+
+
+def test_mixed_python_numbers_and_bools():
+    df = _preview({"mixed": [1, "2", None], "flags": [True, None, False]})
+
+    assert df["mixed"].dtype.kind == "f"
+    assert df["flags"].dtype == object
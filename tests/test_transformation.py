@@ -0,0 +1,83 @@
+"""Regression tests for data_mcp.data_functions.transformation."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_mcp.data_functions.transformation import (
+    _DUCKDB_MIN_ROWS,
+    _apply_frame,
+    _duckdb_pivot_table,
+    _pyarrow_str_fast,
+)
+
+
+@pytest.mark.parametrize("op, expected", [
+    ("strip", ["A", "b", "C"]),
+    ("lower", [" a", "b ", "c"]),
+    ("upper", [" A", "B ", "C"]),
+    ("title", [" A", "B ", "C"]),
+])
+def test_pyarrow_str_fast_keeps_row_order_with_permuted_index(op, expected):
+    series = pd.Series([" A", "b ", "C"], index=[2, 0, 1], name="col", dtype=object)
+
+    result = _pyarrow_str_fast(series, op)
+
+    assert result.tolist() == expected
+    assert result.index.tolist() == [2, 0, 1]
+    assert result.name == "col"
+
+
+def test_pyarrow_str_fast_with_string_index():
+    series = pd.Series([" A", "b ", "C"], index=["x", "y", "z"], dtype=object)
+
+    result = _pyarrow_str_fast(series, "strip")
+
+    assert result.tolist() == ["A", "b", "C"]
+    assert result.index.tolist() == ["x", "y", "z"]
+
+
+@pytest.mark.parametrize("new_column", [None, "out"])
+def test_apply_frame_on_sorted_frame_keeps_rows_aligned(new_column):
+    df = pd.DataFrame({"key": [3, 1, 2], "text": ["z ", " x", "y "]})
+    df["text"] = df["text"].astype(object)
+    sorted_df = df.sort_values("key")
+
+    result, error = _apply_frame(sorted_df, "text", "strip", new_column)
+
+    assert error is None
+    target = new_column or "text"
+    assert result.index.tolist() == [1, 2, 0]
+    assert result["key"].tolist() == [1, 2, 3]
+    assert result[target].tolist() == ["x", "y", "z"]
+
+
+def test_duckdb_pivot_table_declines_mixed_type_object_columns():
+    pytest.importorskip("duckdb")
+    n = _DUCKDB_MIN_ROWS + 2
+    df = pd.DataFrame({
+        "key": np.array([1, "a"] * (n // 2), dtype=object),
+        "col": ["p", "q"] * (n // 2),
+        "val": np.arange(n, dtype=float),
+    })
+
+    assert _duckdb_pivot_table(df, ["key"], ["col"], ["val"], "sum") is None
+
+
+@pytest.mark.parametrize("aggfunc", ["sum", "mean", "min", "max", "count"])
+def test_duckdb_pivot_table_matches_pandas_values_and_dtypes(aggfunc):
+    pytest.importorskip("duckdb")
+    n = _DUCKDB_MIN_ROWS + 10
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "key": rng.choice(["a", "b", "c"], n),
+        "col": rng.choice(["p", "q"], n),
+        "ints": rng.integers(0, 9, n),
+        "floats": rng.random(n),
+    })
+
+    result = _duckdb_pivot_table(df, ["key"], ["col"], ["ints", "floats"], aggfunc)
+    expected = pd.pivot_table(df, index=["key"], columns=["col"], values=["ints", "floats"], aggfunc=aggfunc)
+
+    assert result.dtypes.to_dict() == expected.dtypes.to_dict()
+    pd.testing.assert_frame_equal(result, expected, check_like=True)